@@ -13,31 +13,43 @@ This module contains all authentication-related API endpoints:
 All endpoints follow REST API best practices with proper HTTP status codes.
 """
 
-from datetime import timedelta, timezone, datetime
+import logging
+from datetime import timezone, datetime
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from anyio import from_thread
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
+from redis.exceptions import RedisError
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin
-from app.schemas.token import TokenResponse
-from app.auth.dependencies import get_current_active_user
-from app.auth.email import email_service
-from app.auth.redis import blacklist_token
+from app.schemas.token import TokenResponse, TokenType
+from app.auth.auth_cache import hash_token, invalidate_token, invalidate_user
+from app.auth.dependencies import get_current_active_user, oauth2_scheme
+from app.auth.email_queue import enqueue_email
+from app.auth.jwt import (
+    decode_token,
+    get_access_token_expires_delta,
+    rotate_refresh_token,
+    track_refresh_token,
+)
+from app.auth.redis import add_known_email, blacklist_token, is_known_email
 from app.core.config import get_settings
 
 settings = get_settings()
+BASE_URL = settings.BASE_URL
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def register_user(
     user_data: UserCreate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -47,12 +59,11 @@ def register_user(
     1. Validate user data
     2. Create user account (unverified)
     3. Generate verification token
-    4. Send verification email in background
+    4. Queue verification email
     5. Return user data
     
     Args:
         user_data: User registration data (email, username, password, etc.)
-        background_tasks: FastAPI background tasks for async email sending
         db: Database session
         
     Returns:
@@ -70,16 +81,16 @@ def register_user(
         )
         db.commit()
         db.refresh(user)
+        from_thread.run(add_known_email, user.email)
         
-        # Send verification email in background (non-blocking)
+        # Queue verification email for the email worker (non-blocking)
         if verification_token:
-            background_tasks.add_task(
-                email_service.send_verification_email,
-                to_email=user.email,
-                username=user.username,
-                verification_token=verification_token,
-                base_url=settings.BASE_URL
-            )
+            from_thread.run(enqueue_email, "verification", {
+                "to_email": user.email,
+                "username": user.username,
+                "verification_token": verification_token,
+                "base_url": BASE_URL
+            })
         
         return user
         
@@ -100,7 +111,6 @@ def register_user(
 @router.get("/verify-email", status_code=status.HTTP_200_OK)
 def verify_email(
     token: str = Query(..., description="Email verification token"),
-    background_tasks: BackgroundTasks = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -108,7 +118,6 @@ def verify_email(
     
     Args:
         token: Verification token from email link
-        background_tasks: FastAPI background tasks for welcome email
         db: Database session
         
     Returns:
@@ -135,14 +144,12 @@ def verify_email(
     
     db.commit()
     
-    # Send welcome email in background
-    if background_tasks:
-        background_tasks.add_task(
-            email_service.send_welcome_email,
-            to_email=user.email,
-            username=user.username,
-            first_name=user.first_name
-        )
+    # Queue welcome email
+    from_thread.run(enqueue_email, "welcome", {
+        "to_email": user.email,
+        "username": user.username,
+        "first_name": user.first_name
+    })
     
     return {
         "message": "Email verified successfully! You can now log in.",
@@ -154,7 +161,6 @@ def verify_email(
 @router.post("/resend-verification", status_code=status.HTTP_200_OK)
 def resend_verification_email(
     email: str,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -162,7 +168,6 @@ def resend_verification_email(
     
     Args:
         email: User's email address
-        background_tasks: FastAPI background tasks for email sending
         db: Database session
         
     Returns:
@@ -171,6 +176,10 @@ def resend_verification_email(
     Raises:
         HTTPException: 400 if email not found or already verified
     """
+    # Unknown emails get the generic response without a database query
+    if from_thread.run(is_known_email, email) is False:
+        return {"message": "If the email exists, a verification link has been sent."}
+    
     user = db.query(User).filter(User.email == email).first()
     
     if not user:
@@ -187,14 +196,13 @@ def resend_verification_email(
     verification_token = user.generate_verification_token()
     db.commit()
     
-    # Send verification email
-    background_tasks.add_task(
-        email_service.send_verification_email,
-        to_email=user.email,
-        username=user.username,
-        verification_token=verification_token,
-        base_url=settings.BASE_URL
-    )
+    # Queue verification email
+    from_thread.run(enqueue_email, "verification", {
+        "to_email": user.email,
+        "username": user.username,
+        "verification_token": verification_token,
+        "base_url": BASE_URL
+    })
     
     return {"message": "Verification email sent successfully"}
 
@@ -249,6 +257,15 @@ def login(
     
     db.commit()
     
+    # Start a new refresh token family for this session. If Redis is down
+    # the login still succeeds, but the family is never recorded, so the
+    # refresh token will be rejected and the client must log in again once
+    # the access token expires
+    try:
+        from_thread.run(track_refresh_token, auth_result["refresh_token"])
+    except RedisError:
+        logger.warning("Refresh token family not recorded for user %s", user.id, exc_info=True)
+    
     return {
         "access_token": auth_result["access_token"],
         "refresh_token": auth_result["refresh_token"],
@@ -259,13 +276,18 @@ def login(
 
 
 @router.post("/refresh", response_model=TokenResponse)
-def refresh_token(
+async def refresh_token(
     refresh_token: str,
     db: Session = Depends(get_db)
 ):
     """
     Refresh access token using refresh token.
     
+    Refresh tokens are single-use. Each one belongs to a family started at
+    login, and only the most recently issued token of a family is accepted.
+    Presenting an already-used token revokes the whole family, so a stolen
+    refresh token stops working as soon as either party uses it again.
+    
     Args:
         refresh_token: Valid refresh token
         db: Database session
@@ -274,20 +296,24 @@ def refresh_token(
         TokenResponse: New access token and refresh token
         
     Raises:
-        HTTPException: 401 if refresh token is invalid
+        HTTPException: 401 if refresh token is invalid or was already used,
+            503 if the token family store (Redis) is unavailable
     """
     # Verify refresh token
-    user_id = User.verify_token(refresh_token)
+    payload = await decode_token(refresh_token, TokenType.REFRESH)
     
-    if not user_id:
+    try:
+        user_id = UUID(payload["sub"])
+        family_id = payload["fam"]
+    except (KeyError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get user
-    user = db.query(User).filter(User.id == user_id).first()
+    # Get user (primary-key lookup consults the session identity map first)
+    user = await run_in_threadpool(db.get, User, user_id)
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -295,10 +321,41 @@ def refresh_token(
             detail="User not found or inactive"
         )
     
-    # Generate new tokens
-    access_token = User.create_access_token({"sub": str(user.id)})
-    new_refresh_token = User.create_refresh_token({"sub": str(user.id)})
-    expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    # Tokens issued before the user's last revoke-all are dead
+    if payload.get("ver", 0) != user.jwt_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Generate new tokens (expires_at must match the jittered JWT exp claim)
+    expires_delta = get_access_token_expires_delta()
+    access_token = User.create_access_token(
+        {"sub": str(user.id), "ver": user.jwt_version}, expires_delta
+    )
+    new_refresh_token = User.create_refresh_token(
+        {"sub": str(user.id), "ver": user.jwt_version, "fam": family_id}
+    )
+    expires_at = datetime.now(timezone.utc) + expires_delta
+    
+    # Swap the family's live token; fails if this token was already used.
+    # Single use cannot be enforced without Redis, so refuse to refresh
+    try:
+        rotated = await rotate_refresh_token(payload, new_refresh_token)
+    except RedisError:
+        logger.warning("Refresh token rotation unavailable", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Token refresh is temporarily unavailable"
+        )
+    
+    if not rotated:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has already been used",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
     return {
         "access_token": access_token,
@@ -312,25 +369,27 @@ def refresh_token(
 @router.post("/logout", status_code=status.HTTP_200_OK)
 async def logout(
     current_user: User = Depends(get_current_active_user),
-    # You could pass the token here if you want to blacklist it
+    token: str = Depends(oauth2_scheme)
 ):
     """
-    Logout current user.
+    Logout current user by revoking the access token.
     
-    Note: Since we're using JWT tokens, we can't truly "revoke" them.
-    In production, you'd want to:
-    1. Add token to Redis blacklist
-    2. Set short token expiration times
-    3. Implement token versioning
+    The token's JTI is blacklisted in Redis until the token would have
+    expired anyway, so the key cleans itself up and the blacklist check
+    stays a single O(1) lookup.
     
     Args:
         current_user: Currently authenticated user
+        token: Raw bearer token of the current request
         
     Returns:
         dict: Success message
     """
-    # In production, blacklist the token in Redis
-    # await blacklist_token(token)
+    payload = await decode_token(token, TokenType.ACCESS)
+    await blacklist_token(payload["jti"], payload["exp"])
+    
+    # Drop the cached auth entry so the next use hits the blacklist check
+    await invalidate_token(hash_token(token))
     
     return {
         "message": "Logged out successfully",
@@ -338,10 +397,39 @@ async def logout(
     }
 
 
+@router.post("/revoke-all", status_code=status.HTTP_200_OK)
+def revoke_all_tokens(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke every access and refresh token issued to the current user.
+    
+    Bumps the user's jwt_version, which every token embeds, so all
+    outstanding sessions fail validation without growing the blacklist.
+    
+    Args:
+        current_user: Currently authenticated user
+        db: Database session
+        
+    Returns:
+        dict: Success message
+    """
+    db.query(User).filter(User.id == current_user.id).update(
+        {User.jwt_version: User.jwt_version + 1},
+        synchronize_session=False
+    )
+    db.commit()
+    
+    # Drop cached auth entries so revoked tokens are re-validated
+    from_thread.run(invalidate_user, current_user.id)
+    
+    return {"message": "All sessions have been revoked. Please log in again."}
+
+
 @router.post("/forgot-password", status_code=status.HTTP_200_OK)
 def forgot_password(
     email: str,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -349,12 +437,15 @@ def forgot_password(
     
     Args:
         email: User's email address
-        background_tasks: FastAPI background tasks for email sending
         db: Database session
         
     Returns:
         dict: Success message (generic for security)
     """
+    # Unknown emails get the generic response without a database query
+    if from_thread.run(is_known_email, email) is False:
+        return {"message": "If the email exists, a password reset link has been sent."}
+    
     user = db.query(User).filter(User.email == email).first()
     
     # Always return success to prevent email enumeration
@@ -365,14 +456,13 @@ def forgot_password(
     reset_token = user.generate_reset_token()
     db.commit()
     
-    # Send password reset email
-    background_tasks.add_task(
-        email_service.send_password_reset_email,
-        to_email=user.email,
-        username=user.username,
-        reset_token=reset_token,
-        base_url=settings.BASE_URL
-    )
+    # Queue password reset email
+    from_thread.run(enqueue_email, "password_reset", {
+        "to_email": user.email,
+        "username": user.username,
+        "reset_token": reset_token,
+        "base_url": BASE_URL
+    })
     
     return {"message": "If the email exists, a password reset link has been sent."}
 
@@ -397,6 +487,13 @@ def reset_password(
     Raises:
         HTTPException: 400 if token is invalid or expired
     """
+    # Validate new password
+    if len(new_password) < 6:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Password must be at least 6 characters long"
+        )
+    
     # Find user with this reset token
     user = db.query(User).filter(User.reset_token == token).first()
     
@@ -413,19 +510,30 @@ def reset_password(
             detail="Reset token has expired. Please request a new one."
         )
     
-    # Validate new password
-    if len(new_password) < 6:
+    # Only a valid token gets to spend bcrypt time. Release the pooled
+    # connection while it runs, then reload the user
+    user_id = user.id
+    db.close()
+    hashed_password = User.hash_password(new_password)
+    
+    # Re-check in case the token was used while the password was hashing
+    user = db.get(User, user_id)
+    if not user or not user.verify_reset_token(token):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must be at least 6 characters long"
+            detail="Invalid reset token"
         )
     
-    # Update password
-    user.password = User.hash_password(new_password)
+    # Update password and revoke every token issued with the old one
+    user.password = hashed_password
     user.reset_token = None
     user.reset_token_expires = None
+    user.jwt_version = User.jwt_version + 1
     db.commit()
     
+    # Drop cached auth entries for this user's existing tokens
+    from_thread.run(invalidate_user, user.id)
+    
     return {"message": "Password reset successfully. You can now log in with your new password."}
 
 
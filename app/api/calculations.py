@@ -11,10 +11,13 @@ This module contains all calculation-related API endpoints following BREAD patte
 All endpoints require JWT authentication.
 """
 
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import delete, tuple_
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -25,6 +28,9 @@ from app.auth.dependencies import get_current_active_user
 
 router = APIRouter(prefix="/api/calculations", tags=["Calculations"])
 
+# Validates and serializes a whole page of calculations in one pass
+calculation_list_adapter = TypeAdapter(List[CalculationResponse])
+
 
 @router.post("/", response_model=CalculationResponse, status_code=status.HTTP_201_CREATED)
 def create_calculation(
@@ -36,55 +42,93 @@ def create_calculation(
     Create a new calculation (Add in BREAD).
     
     Args:
-        calculation: Calculation data (operation, operand1, operand2)
+        calculation: Calculation data (type, inputs)
         current_user: Authenticated user
         db: Database session
         
     Returns:
         CalculationResponse: Created calculation with result
     """
-    # Create new calculation
-    db_calculation = Calculation(
-        user_id=current_user.id,
-        operation=calculation.operation,
-        operand1=calculation.operand1,
-        operand2=calculation.operand2
+    # Create new calculation of the requested type
+    db_calculation = Calculation.create(
+        calculation.type.value,
+        current_user.id,
+        calculation.inputs
     )
     
     # Calculate result
-    db_calculation.calculate()
+    try:
+        db_calculation.result = db_calculation.get_result()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
+    # id and timestamps are generated in Python, so everything the response
+    # needs is known after the INSERT; serialize before commit expires it
     db.add(db_calculation)
+    db.flush()
+    response = CalculationResponse.model_validate(db_calculation)
     db.commit()
-    db.refresh(db_calculation)
     
-    return db_calculation
+    return response
 
 
 @router.get("/", response_model=List[CalculationResponse])
 def list_calculations(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[datetime] = None,
+    cursor_id: Optional[UUID] = None,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
-    List all calculations for current user (Browse in BREAD).
+    List all calculations for current user, newest first (Browse in BREAD).
+    
+    Pass the created_at and id of the last item received as `cursor` and
+    `cursor_id` to fetch the next page (keyset pagination). Unlike a large
+    `skip`, this seeks straight to the page through the
+    (user_id, created_at, id) index. The id breaks ties between
+    calculations created in the same instant, so none are skipped or
+    repeated across pages.
     
     Args:
-        skip: Number of records to skip (pagination)
+        skip: Number of records to skip (offset pagination)
         limit: Maximum number of records to return
+        cursor: Return only calculations created before this time
+        cursor_id: Id of the last item received; with `cursor`, also returns
+            calculations created at exactly `cursor` that sort after it
         current_user: Authenticated user
         db: Database session
         
     Returns:
         List[CalculationResponse]: List of user's calculations
     """
-    calculations = db.query(Calculation).filter(
+    query = db.query(Calculation).filter(
         Calculation.user_id == current_user.id
+    )
+    
+    if cursor is not None and cursor_id is not None:
+        query = query.filter(
+            tuple_(Calculation.created_at, Calculation.id) < tuple_(cursor, cursor_id)
+        )
+    elif cursor is not None:
+        query = query.filter(Calculation.created_at < cursor)
+    
+    calculations = query.order_by(
+        Calculation.created_at.desc(),
+        Calculation.id.desc()
     ).offset(skip).limit(limit).all()
     
-    return calculations
+    # Encode straight to JSON bytes instead of letting FastAPI re-validate
+    # the page and then run it through json.dumps
+    page = calculation_list_adapter.validate_python(calculations, from_attributes=True)
+    return Response(
+        content=calculation_list_adapter.dump_json(page),
+        media_type="application/json"
+    )
 
 
 @router.get("/{calculation_id}", response_model=CalculationResponse)
@@ -107,12 +151,10 @@ def get_calculation(
     Raises:
         HTTPException: 404 if calculation not found or doesn't belong to user
     """
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calculation_id,
-        Calculation.user_id == current_user.id
-    ).first()
+    # Primary-key lookup consults the session identity map before issuing SQL
+    calculation = db.get(Calculation, calculation_id)
     
-    if not calculation:
+    if calculation is None or calculation.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Calculation not found"
@@ -143,12 +185,9 @@ def update_calculation(
     Raises:
         HTTPException: 404 if calculation not found or doesn't belong to user
     """
-    db_calculation = db.query(Calculation).filter(
-        Calculation.id == calculation_id,
-        Calculation.user_id == current_user.id
-    ).first()
+    db_calculation = db.get(Calculation, calculation_id)
     
-    if not db_calculation:
+    if db_calculation is None or db_calculation.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Calculation not found"
@@ -160,12 +199,22 @@ def update_calculation(
         setattr(db_calculation, field, value)
     
     # Recalculate result
-    db_calculation.calculate()
+    try:
+        db_calculation.result = db_calculation.get_result()
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
+    # Flush the UPDATE and serialize before commit expires the instance,
+    # so no refresh SELECT is needed to build the response
+    db.flush()
+    response = CalculationResponse.model_validate(db_calculation)
     db.commit()
-    db.refresh(db_calculation)
     
-    return db_calculation
+    return response
 
 
 @router.delete("/{calculation_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -188,18 +237,21 @@ def delete_calculation(
     Raises:
         HTTPException: 404 if calculation not found or doesn't belong to user
     """
-    db_calculation = db.query(Calculation).filter(
-        Calculation.id == calculation_id,
-        Calculation.user_id == current_user.id
-    ).first()
+    # Delete directly; the ownership check is part of the WHERE clause
+    result = db.execute(
+        delete(Calculation).where(
+            Calculation.id == calculation_id,
+            Calculation.user_id == current_user.id
+        )
+    )
     
-    if not db_calculation:
+    if result.rowcount == 0:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Calculation not found"
         )
     
-    db.delete(db_calculation)
     db.commit()
     
     return None
@@ -222,20 +274,18 @@ def get_calculation_stats(
     """
     from sqlalchemy import func
     
-    # Get total count
-    total = db.query(func.count(Calculation.id)).filter(
-        Calculation.user_id == current_user.id
-    ).scalar()
-    
-    # Get count by operation
+    # Count by type in one grouped query; the total is derived from it.
+    # count(*) reads nothing outside (user_id, type), so the scan can be
+    # index-only on ix_calculations_user_type
     operations = db.query(
-        Calculation.operation,
-        func.count(Calculation.id).label('count')
+        Calculation.type,
+        func.count().label('count')
     ).filter(
         Calculation.user_id == current_user.id
-    ).group_by(Calculation.operation).all()
+    ).group_by(Calculation.type).all()
     
     operations_dict = {op: count for op, count in operations}
+    total = sum(operations_dict.values())
     
     return {
         "total_calculations": total,
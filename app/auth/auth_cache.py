@@ -0,0 +1,182 @@
+# app/auth/auth_cache.py
+"""
+Auth Cache Module
+
+Short-lived Redis cache of authenticated users, keyed by a hash of the
+access token. A cache hit lets an authenticated request skip JWT
+verification and the user lookup entirely.
+
+Keys:
+- auth:user:{sha256(token)}  -> JSON snapshot of the user (UserResponse)
+- auth:user_tokens:{user_id} -> set of token hashes cached for that user
+- auth:user_gen:{user_id}    -> counter bumped whenever the user's entries
+                                are invalidated
+
+A miss reads the user's generation before loading the user, and the entry
+is only written if the generation is unchanged and the token's JTI has
+not been blacklisted in the meantime. Otherwise a miss that loaded the
+user just before a revoke-all, password reset or logout could write the
+stale snapshot back after the invalidation, and the revoked token would
+keep authenticating from the cache.
+
+The cache is an optimization only, so Redis errors are treated as a miss.
+"""
+
+import hashlib
+import time
+from typing import Optional, Union
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.auth.redis import blacklist_key, get_redis
+from app.core.config import get_settings
+from app.schemas.user import UserResponse
+
+settings = get_settings()
+
+# Generation counters outlive any entry written against them
+USER_GEN_TTL = 24 * 60 * 60
+
+# Write the entry only if nothing was invalidated since the user was loaded
+_CACHE_AUTH_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+redis.call('SADD', KEYS[4], ARGV[4])
+redis.call('EXPIRE', KEYS[4], ARGV[5])
+return 1
+"""
+
+
+def hash_token(token: str) -> str:
+    """Return the SHA-256 hex digest used to key a token in the cache."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _user_key(token_hash: str) -> str:
+    return f"auth:user:{token_hash}"
+
+
+def _user_tokens_key(user_id: Union[str, UUID]) -> str:
+    return f"auth:user_tokens:{user_id}"
+
+
+def _user_gen_key(user_id: Union[str, UUID]) -> str:
+    return f"auth:user_gen:{user_id}"
+
+
+async def get_cached_auth(token_hash: str) -> Optional[UserResponse]:
+    """
+    Look up the user cached for a token.
+
+    Args:
+        token_hash: Hash of the access token (see hash_token)
+
+    Returns:
+        UserResponse: Cached user snapshot, or None on a miss
+    """
+    try:
+        redis = await get_redis()
+        cached = await redis.get(_user_key(token_hash))
+    except RedisError:
+        return None
+
+    if cached is None:
+        return None
+    return UserResponse.model_validate_json(cached)
+
+
+async def get_user_generation(user_id: Union[str, UUID]) -> Optional[str]:
+    """
+    Read the user's cache generation; call before loading the user.
+
+    Returns:
+        str: Generation to pass to cache_auth, or None if Redis is unavailable
+    """
+    try:
+        redis = await get_redis()
+        generation = await redis.get(_user_gen_key(user_id))
+    except RedisError:
+        return None
+
+    if generation is None:
+        return "0"
+    return generation.decode() if isinstance(generation, bytes) else generation
+
+
+async def cache_auth(
+    token_hash: str,
+    user: UserResponse,
+    exp: int,
+    jti: str,
+    generation: Optional[str]
+) -> None:
+    """
+    Cache the user resolved for a token.
+
+    The entry lives for AUTH_CACHE_USER_TTL seconds, or until the token
+    expires if that is sooner. The token hash is also recorded in the
+    user's index set so every entry for the user can be invalidated.
+    Nothing is written if the user was invalidated or the token was
+    blacklisted after `generation` was read.
+
+    Args:
+        token_hash: Hash of the access token (see hash_token)
+        user: Resolved user snapshot
+        exp: Token expiration as a UNIX timestamp
+        jti: Token ID, checked against the blacklist
+        generation: Value of get_user_generation read before loading the user
+    """
+    ttl = min(settings.AUTH_CACHE_USER_TTL, int(exp - time.time()))
+    if ttl <= 0 or generation is None:
+        return
+
+    try:
+        redis = await get_redis()
+        await redis.eval(
+            _CACHE_AUTH_SCRIPT,
+            4,
+            _user_key(token_hash),
+            _user_gen_key(user.id),
+            blacklist_key(jti),
+            _user_tokens_key(user.id),
+            generation,
+            user.model_dump_json(),
+            ttl,
+            token_hash,
+            settings.AUTH_CACHE_USER_TTL
+        )
+    except RedisError:
+        pass
+
+
+async def invalidate_token(token_hash: str) -> None:
+    """Drop the cached user for a single token."""
+    try:
+        redis = await get_redis()
+        await redis.delete(_user_key(token_hash))
+    except RedisError:
+        pass
+
+
+async def invalidate_user(user_id: Union[str, UUID]) -> None:
+    """Drop every cached entry for a user, e.g. after a password change."""
+    tokens_key = _user_tokens_key(user_id)
+    gen_key = _user_gen_key(user_id)
+    try:
+        redis = await get_redis()
+        # Bump first so an in-flight miss cannot write its snapshot back
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.incr(gen_key)
+            pipe.expire(gen_key, USER_GEN_TTL)
+            await pipe.execute()
+        token_hashes = await redis.smembers(tokens_key)
+        keys = [_user_key(h.decode() if isinstance(h, bytes) else h) for h in token_hashes]
+        await redis.delete(tokens_key, *keys)
+    except RedisError:
+        pass
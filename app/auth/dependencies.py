@@ -1,7 +1,13 @@
 from datetime import datetime
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
+from app.auth.auth_cache import cache_auth, get_cached_auth, get_user_generation, hash_token
+from app.auth.jwt import decode_token
+from app.database import get_db
+from app.schemas.token import TokenType
 from app.schemas.user import UserResponse
 from app.models.user import User
 
@@ -67,8 +73,48 @@ def get_current_user(
     except Exception:
         raise credentials_exception
 
+async def get_authenticated_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> UserResponse:
+    """
+    Dependency to resolve the current user from the JWT token and the database.
+    The Redis auth cache is consulted first; on a miss the token is verified,
+    the user row is loaded by primary key and the result is cached.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    token_hash = hash_token(token)
+    cached_user = await get_cached_auth(token_hash)
+    if cached_user is not None:
+        return cached_user
+
+    payload = await decode_token(token, TokenType.ACCESS)
+    try:
+        user_id = UUID(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        raise credentials_exception
+
+    # Read before the user is loaded so a concurrent revocation is detected
+    generation = await get_user_generation(user_id)
+    user = await run_in_threadpool(db.get, User, user_id)
+    if user is None:
+        raise credentials_exception
+    
+    # Tokens issued before the user's last revoke-all are dead
+    if payload.get("ver", 0) != user.jwt_version:
+        raise credentials_exception
+
+    current_user = UserResponse.model_validate(user)
+    await cache_auth(token_hash, current_user, payload["exp"], payload["jti"], generation)
+    return current_user
+
 def get_current_active_user(
-    current_user: UserResponse = Depends(get_current_user)
+    current_user: UserResponse = Depends(get_authenticated_user)
 ) -> UserResponse:
     """
     Dependency to ensure that the current user is active.
@@ -7,18 +7,146 @@ This module handles all email-related functionality for the application:
 - Welcome emails
 - Notification emails
 
-Uses SMTP for sending emails with HTML templates.
+Uses SMTP for sending emails with Jinja2 templates from email_templates/.
 """
 
+import logging
+import os
+import queue
 import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
 from datetime import datetime, timedelta, timezone
 import secrets
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 from app.core.config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Email bodies are compiled once at import. HTML templates autoescape, so
+# user-supplied values such as the username cannot inject markup.
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "email_templates")
+template_env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+    cache_size=-1
+)
+
+# Copyright year, refreshed once the current year has ended
+_year_cache = {"year": 0, "expires": 0.0}
+
+
+def _current_year() -> int:
+    """Return the current year, recomputed only when the year rolls over."""
+    now = time.time()
+    if now >= _year_cache["expires"]:
+        year = datetime.now().year
+        _year_cache["year"] = year
+        _year_cache["expires"] = datetime(year + 1, 1, 1).timestamp()
+    return _year_cache["year"]
+
+
+# Values shared by every email are globals, so sends only pass their own
+template_env.globals["app_name"] = settings.APP_NAME
+template_env.globals["current_year"] = _current_year
+
+VERIFICATION_HTML = template_env.get_template("verification.html")
+VERIFICATION_TEXT = template_env.get_template("verification.txt")
+WELCOME_HTML = template_env.get_template("welcome.html")
+WELCOME_TEXT = template_env.get_template("welcome.txt")
+PASSWORD_RESET_HTML = template_env.get_template("password_reset.html")
+PASSWORD_RESET_TEXT = template_env.get_template("password_reset.txt")
+
+
+class SMTPConnectionPool:
+    """
+    Pool of SMTP connections that are already past STARTTLS and login.
+    
+    Reusing a connection skips the connect, TLS handshake and AUTH round
+    trips that otherwise dominate the time spent on each email.
+    """
+    
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: Optional[str],
+        password: Optional[str],
+        max_size: int = 5,
+        max_messages: int = 100
+    ):
+        """
+        Args:
+            host: SMTP server host
+            port: SMTP server port
+            user: SMTP username
+            password: SMTP password
+            max_size: Maximum number of idle connections kept open
+            max_messages: Sends after which a connection is replaced
+                (providers cap messages per connection)
+        """
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.max_messages = max_messages
+        self._idle = queue.LifoQueue(maxsize=max_size)
+    
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port)
+        try:
+            server.starttls()
+            server.login(self.user, self.password)
+        except Exception:
+            # Connected but unusable; don't leak the socket
+            server.close()
+            raise
+        server.messages_sent = 0
+        return server
+    
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except smtplib.SMTPException:
+            server.close()
+        except OSError:
+            pass
+    
+    def acquire(self) -> smtplib.SMTP:
+        """Return a healthy idle connection, or open a new one."""
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close(server)
+    
+    def release(self, server: smtplib.SMTP) -> None:
+        """Return a connection after a successful send."""
+        server.messages_sent += 1
+        if server.messages_sent >= self.max_messages:
+            self._close(server)
+            return
+        
+        try:
+            self._idle.put_nowait(server)
+        except queue.Full:
+            self._close(server)
+    
+    def discard(self, server: smtplib.SMTP) -> None:
+        """Drop a connection that failed mid-send."""
+        self._close(server)
 
 
 class EmailService:
@@ -32,6 +160,14 @@ class EmailService:
         self.smtp_password = settings.SMTP_PASSWORD
         self.smtp_from = settings.SMTP_FROM
         self.app_name = settings.APP_NAME
+        self.pool = SMTPConnectionPool(
+            self.smtp_host,
+            self.smtp_port,
+            self.smtp_user,
+            self.smtp_password,
+            max_size=settings.SMTP_POOL_SIZE,
+            max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION
+        )
         
     def _send_email(
         self,
@@ -68,16 +204,19 @@ class EmailService:
             part2 = MIMEText(html_content, 'html')
             msg.attach(part2)
             
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
+            # Send email over a pooled, already authenticated connection
+            server = self.pool.acquire()
+            try:
                 server.send_message(msg)
+            except Exception:
+                self.pool.discard(server)
+                raise
+            self.pool.release(server)
                 
             return True
             
-        except Exception as e:
-            print(f"Error sending email: {str(e)}")
+        except Exception:
+            logger.exception("SMTP send failed to=%s subject=%s", to_email, subject)
             return False
     
     def send_verification_email(
@@ -103,113 +242,15 @@ class EmailService:
         
         subject = f"Verify your {self.app_name} account"
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .container {{
-                    background-color: #f9f9f9;
-                    border-radius: 10px;
-                    padding: 30px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                .header {{
-                    text-align: center;
-                    margin-bottom: 30px;
-                }}
-                .header h1 {{
-                    color: #4CAF50;
-                    margin: 0;
-                }}
-                .content {{
-                    background-color: white;
-                    padding: 20px;
-                    border-radius: 5px;
-                    margin-bottom: 20px;
-                }}
-                .button {{
-                    display: inline-block;
-                    padding: 12px 30px;
-                    background-color: #4CAF50;
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    font-weight: bold;
-                    margin: 20px 0;
-                }}
-                .button:hover {{
-                    background-color: #45a049;
-                }}
-                .footer {{
-                    text-align: center;
-                    color: #777;
-                    font-size: 12px;
-                    margin-top: 20px;
-                }}
-                .warning {{
-                    background-color: #fff3cd;
-                    border-left: 4px solid #ffc107;
-                    padding: 10px;
-                    margin: 15px 0;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>{self.app_name}</h1>
-                    <p>Email Verification</p>
-                </div>
-                
-                <div class="content">
-                    <h2>Welcome, {username}! 👋</h2>
-                    
-                    <p>Thank you for registering with {self.app_name}. To complete your registration and start using your account, please verify your email address.</p>
-                    
-                    <div style="text-align: center;">
-                        <a href="{verification_link}" class="button">Verify Email Address</a>
-                    </div>
-                    
-                    <p>Or copy and paste this link into your browser:</p>
-                    <p style="word-break: break-all; color: #666; font-size: 12px;">
-                        {verification_link}
-                    </p>
-                    
-                    <div class="warning">
-                        <strong>⏱️ Important:</strong> This verification link will expire in 24 hours for security reasons.
-                    </div>
-                </div>
-                
-                <div class="footer">
-                    <p>If you didn't create an account with {self.app_name}, please ignore this email.</p>
-                    <p>© {datetime.now().year} {self.app_name}. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        text_content = f"""
-        Welcome to {self.app_name}, {username}!
+        html_content = VERIFICATION_HTML.render(
+            username=username,
+            verification_link=verification_link
+        )
         
-        Please verify your email address by clicking the link below:
-        {verification_link}
-        
-        This link will expire in 24 hours.
-        
-        If you didn't create an account, please ignore this email.
-        """
+        text_content = VERIFICATION_TEXT.render(
+            username=username,
+            verification_link=verification_link
+        )
         
         return self._send_email(to_email, subject, html_content, text_content)
     
@@ -232,85 +273,13 @@ class EmailService:
         """
         subject = f"Welcome to {self.app_name}!"
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .container {{
-                    background-color: #f9f9f9;
-                    border-radius: 10px;
-                    padding: 30px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                .header {{
-                    text-align: center;
-                    margin-bottom: 30px;
-                }}
-                .header h1 {{
-                    color: #4CAF50;
-                    margin: 0;
-                }}
-                .content {{
-                    background-color: white;
-                    padding: 20px;
-                    border-radius: 5px;
-                    margin-bottom: 20px;
-                }}
-                .footer {{
-                    text-align: center;
-                    color: #777;
-                    font-size: 12px;
-                    margin-top: 20px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🎉 Welcome to {self.app_name}!</h1>
-                </div>
-                
-                <div class="content">
-                    <h2>Hello, {first_name}! 👋</h2>
-                    
-                    <p>Your email has been verified successfully! You can now access all features of {self.app_name}.</p>
-                    
-                    <h3>Getting Started:</h3>
-                    <ul>
-                        <li>Create your first calculation</li>
-                        <li>Explore the dashboard</li>
-                        <li>Customize your profile</li>
-                    </ul>
-                    
-                    <p>If you have any questions or need assistance, feel free to reach out to our support team.</p>
-                </div>
-                
-                <div class="footer">
-                    <p>© {datetime.now().year} {self.app_name}. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        html_content = WELCOME_HTML.render(
+            first_name=first_name
+        )
         
-        text_content = f"""
-        Welcome to {self.app_name}, {first_name}!
-        
-        Your email has been verified successfully!
-        
-        You can now access all features of {self.app_name}.
-        """
+        text_content = WELCOME_TEXT.render(
+            first_name=first_name
+        )
         
         return self._send_email(to_email, subject, html_content, text_content)
     
@@ -337,108 +306,15 @@ class EmailService:
         
         subject = f"{self.app_name} - Password Reset Request"
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .container {{
-                    background-color: #f9f9f9;
-                    border-radius: 10px;
-                    padding: 30px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                .header {{
-                    text-align: center;
-                    margin-bottom: 30px;
-                }}
-                .content {{
-                    background-color: white;
-                    padding: 20px;
-                    border-radius: 5px;
-                    margin-bottom: 20px;
-                }}
-                .button {{
-                    display: inline-block;
-                    padding: 12px 30px;
-                    background-color: #f44336;
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    font-weight: bold;
-                    margin: 20px 0;
-                }}
-                .warning {{
-                    background-color: #ffebee;
-                    border-left: 4px solid #f44336;
-                    padding: 10px;
-                    margin: 15px 0;
-                }}
-                .footer {{
-                    text-align: center;
-                    color: #777;
-                    font-size: 12px;
-                    margin-top: 20px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>{self.app_name}</h1>
-                    <p>Password Reset Request</p>
-                </div>
-                
-                <div class="content">
-                    <h2>Hello, {username}! 🔐</h2>
-                    
-                    <p>We received a request to reset your password. Click the button below to create a new password:</p>
-                    
-                    <div style="text-align: center;">
-                        <a href="{reset_link}" class="button">Reset Password</a>
-                    </div>
-                    
-                    <p>Or copy and paste this link into your browser:</p>
-                    <p style="word-break: break-all; color: #666; font-size: 12px;">
-                        {reset_link}
-                    </p>
-                    
-                    <div class="warning">
-                        <strong>⏱️ Important:</strong> This link will expire in 1 hour for security reasons.
-                    </div>
-                </div>
-                
-                <div class="footer">
-                    <p><strong>Didn't request this?</strong> You can safely ignore this email. Your password will not be changed.</p>
-                    <p>© {datetime.now().year} {self.app_name}. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        html_content = PASSWORD_RESET_HTML.render(
+            username=username,
+            reset_link=reset_link
+        )
         
-        text_content = f"""
-        Password Reset Request - {self.app_name}
-        
-        Hello {username},
-        
-        We received a request to reset your password. Click the link below:
-        {reset_link}
-        
-        This link will expire in 1 hour.
-        
-        If you didn't request this, please ignore this email.
-        """
+        text_content = PASSWORD_RESET_TEXT.render(
+            username=username,
+            reset_link=reset_link
+        )
         
         return self._send_email(to_email, subject, html_content, text_content)
 
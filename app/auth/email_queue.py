@@ -0,0 +1,239 @@
+# app/auth/email_queue.py
+"""
+Email Queue Module
+
+Outgoing emails are queued on a Redis Stream and sent by a separate worker
+process, so SMTP latency never ties up the API workers.
+
+Stream:
+- emails -> one entry per email: {"kind": ..., <send_* keyword arguments>}
+
+Run the worker with:
+
+    python -m app.auth.email_queue
+
+Entries are acknowledged and deleted once sent; they carry verification
+and reset tokens in plaintext, so they are not left in the stream until
+trimming catches up. A failed send stays pending and is retried with
+exponential backoff, up to EMAIL_MAX_DELIVERIES attempts.
+
+If Redis is unavailable when an email is queued, it is sent in-process
+instead so it is not lost. That send runs in the background, so the
+request still returns without waiting on SMTP.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import socket
+from typing import Dict, Optional, Set
+
+from anyio import to_thread
+from redis.exceptions import RedisError, ResponseError
+
+from app.auth.email import email_service
+from app.auth.redis import get_redis
+from app.core.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+EMAIL_STREAM = "emails"
+EMAIL_GROUP = "email-workers"
+
+# Upper bound on stream length; trimming is approximate so it stays O(1)
+EMAIL_STREAM_MAXLEN = 10000
+
+# Failed sends are retried after 1, 2, 4, ... minutes, then dropped
+EMAIL_RETRY_BASE_MS = 60000
+EMAIL_MAX_DELIVERIES = 5
+
+# Email kind -> EmailService method that sends it
+EMAIL_SENDERS = {
+    "verification": email_service.send_verification_email,
+    "welcome": email_service.send_welcome_email,
+    "password_reset": email_service.send_password_reset_email,
+}
+
+# In-process sends started while Redis is down, referenced until they
+# finish so they are not garbage collected mid-send
+_direct_sends: Set[asyncio.Task] = set()
+
+
+def _send_in_background(kind: str, fields: Dict[str, str]) -> None:
+    """Start sending an email on a worker thread without waiting for it."""
+    sender = EMAIL_SENDERS[kind]
+    task = asyncio.get_running_loop().create_task(
+        to_thread.run_sync(lambda: sender(**fields))
+    )
+    _direct_sends.add(task)
+    task.add_done_callback(_direct_sends.discard)
+
+
+async def enqueue_email(kind: str, fields: Dict[str, str]) -> None:
+    """
+    Queue an email for the worker.
+
+    Args:
+        kind: Email kind (a key of EMAIL_SENDERS)
+        fields: Keyword arguments for the matching EmailService method
+    """
+    if kind not in EMAIL_SENDERS:
+        raise ValueError(f"Unknown email kind: {kind}")
+
+    try:
+        redis = await get_redis()
+        await redis.xadd(
+            EMAIL_STREAM,
+            {"kind": kind, **fields},
+            maxlen=EMAIL_STREAM_MAXLEN,
+            approximate=True
+        )
+    except RedisError:
+        logger.warning("Email queue unavailable, sending %s email directly", kind, exc_info=True)
+        _send_in_background(kind, fields)
+
+
+def _decode(entry: Dict) -> Dict[str, str]:
+    return {
+        (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+        for k, v in entry.items()
+    }
+
+
+async def _ack(redis, message_id) -> None:
+    """Acknowledge an entry and remove it from the stream."""
+    await redis.xack(EMAIL_STREAM, EMAIL_GROUP, message_id)
+    await redis.xdel(EMAIL_STREAM, message_id)
+
+
+async def _deliver(redis, message_id, entry: Optional[Dict]) -> None:
+    """Send one queued email, acknowledging it unless the send failed."""
+    if entry is None:
+        # Trimmed from the stream while still pending; nothing left to send
+        await _ack(redis, message_id)
+        return
+
+    fields = _decode(entry)
+    kind = fields.pop("kind", None)
+    sender = EMAIL_SENDERS.get(kind)
+
+    # Malformed entries can never succeed; drop them instead of retrying
+    try:
+        if sender is None:
+            raise TypeError(f"unknown email kind {kind!r}")
+        inspect.signature(sender).bind(**fields)
+    except TypeError:
+        logger.error("Dropping malformed email %s", message_id, exc_info=True)
+        await _ack(redis, message_id)
+        return
+
+    try:
+        sent = await to_thread.run_sync(lambda: sender(**fields))
+    except Exception:
+        # e.g. a template error; one bad entry must not stop the worker
+        logger.exception("Sending %s email %s failed", kind, message_id)
+        sent = False
+
+    if not sent:
+        # Left pending; _retry_failed picks it up after a backoff
+        return
+
+    await _ack(redis, message_id)
+
+
+async def _retry_failed(redis, consumer: str, batch_size: int) -> None:
+    """Claim and resend pending entries whose backoff has elapsed."""
+    start = "-"
+    while True:
+        pending = await redis.xpending_range(
+            EMAIL_STREAM,
+            EMAIL_GROUP,
+            min=start,
+            max="+",
+            count=batch_size,
+            idle=EMAIL_RETRY_BASE_MS
+        )
+
+        for info in pending:
+            message_id = info["message_id"]
+            attempts = info["times_delivered"]
+
+            if attempts >= EMAIL_MAX_DELIVERIES:
+                logger.error("Giving up on email %s after %d attempts", message_id, attempts)
+                await _ack(redis, message_id)
+                continue
+
+            backoff_ms = EMAIL_RETRY_BASE_MS * 2 ** (attempts - 1)
+            if info["time_since_delivered"] < backoff_ms:
+                continue
+
+            # XCLAIM re-checks the idle time, so only one worker wins the entry
+            claimed = await redis.xclaim(
+                EMAIL_STREAM, EMAIL_GROUP, consumer, backoff_ms, [message_id]
+            )
+            for claimed_id, entry in claimed:
+                await _deliver(redis, claimed_id, entry)
+
+        if len(pending) < batch_size:
+            return
+
+        # Entries still in their backoff stay pending; page past them
+        last_id = pending[-1]["message_id"]
+        start = "(" + (last_id.decode() if isinstance(last_id, bytes) else last_id)
+
+
+async def run_worker(consumer: str = None, batch_size: int = 10) -> None:
+    """
+    Consume the email stream forever.
+
+    Entries left pending by a previous run of this consumer are delivered
+    first, then new entries are read as they arrive.
+
+    Args:
+        consumer: Consumer name within the group (defaults to host-pid)
+        batch_size: Maximum entries to read per call
+    """
+    consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+    redis = await get_redis()
+
+    try:
+        await redis.xgroup_create(EMAIL_STREAM, EMAIL_GROUP, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+    # "0" replays this consumer's pending entries, ">" reads new ones
+    last_id = "0"
+    while True:
+        response = await redis.xreadgroup(
+            EMAIL_GROUP,
+            consumer,
+            {EMAIL_STREAM: last_id},
+            count=batch_size,
+            block=5000
+        )
+        messages = response[0][1] if response else []
+
+        if last_id != ">" and not messages:
+            last_id = ">"
+            continue
+
+        for message_id, entry in messages:
+            await _deliver(redis, message_id, entry)
+
+        # While replaying, move past entries whose resend failed again
+        if last_id != ">":
+            last_id = messages[-1][0]
+
+        await _retry_failed(redis, consumer, batch_size)
+
+
+if __name__ == "__main__":
+    listener = setup_logging()
+    listener.start()
+    logger.info("Email worker consuming '%s' stream", EMAIL_STREAM)
+    try:
+        asyncio.run(run_worker())
+    finally:
+        listener.stop()
@@ -6,16 +6,21 @@ from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from uuid import UUID
+from redis.exceptions import RedisError
+import logging
+import random
 import secrets
+import time
 
 from app.core.config import get_settings
-from app.auth.redis import add_to_blacklist, is_blacklisted
+from app.auth.redis import add_to_blacklist, is_blacklisted, rotate_refresh_jti, store_refresh_jti
 from app.schemas.token import TokenType
 from app.database import get_db
 from sqlalchemy.orm import Session
 from app.models.user import User
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Password hashing
 pwd_context = CryptContext(
@@ -30,14 +35,30 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
 
+def dummy_verify_password() -> None:
+    """
+    Spend the same bcrypt work as verify_password when no user matched,
+    so response time does not reveal whether an account exists.
+    """
+    pwd_context.dummy_verify()
+
 def get_password_hash(password: str) -> str:
     """Hash a password using bcrypt."""
     return pwd_context.hash(password)
 
+def get_access_token_expires_delta() -> timedelta:
+    """
+    Lifetime for a new access token, with random jitter added so tokens
+    issued in a burst do not all expire (and refresh) at the same moment.
+    """
+    jitter = random.randint(0, settings.JWT_EXPIRATION_JITTER_SECONDS)
+    return timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES, seconds=jitter)
+
 def create_token(
     user_id: Union[str, UUID],
     token_type: TokenType,
-    expires_delta: Optional[timedelta] = None
+    expires_delta: Optional[timedelta] = None,
+    extra_claims: Optional[dict[str, Any]] = None
 ) -> str:
     """
     Create a JWT token (access or refresh).
@@ -46,9 +67,7 @@ def create_token(
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         if token_type == TokenType.ACCESS:
-            expire = datetime.now(timezone.utc) + timedelta(
-                minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-            )
+            expire = datetime.now(timezone.utc) + get_access_token_expires_delta()
         else:
             expire = datetime.now(timezone.utc) + timedelta(
                 days=settings.REFRESH_TOKEN_EXPIRE_DAYS
@@ -64,6 +83,8 @@ def create_token(
         "iat": datetime.now(timezone.utc),
         "jti": secrets.token_hex(16)
     }
+    if extra_claims:
+        to_encode.update(extra_claims)
 
     secret = (
         settings.JWT_SECRET_KEY 
@@ -108,7 +129,15 @@ async def decode_token(
                 headers={"WWW-Authenticate": "Bearer"},
             )
             
-        if await is_blacklisted(payload["jti"]):
+        try:
+            revoked = await is_blacklisted(payload["jti"])
+        except RedisError:
+            # Fail open: a Redis outage must not log every user out, and
+            # revoked tokens still expire on their own shortly after
+            logger.warning("Blacklist unavailable, accepting token %s", payload["jti"], exc_info=True)
+            revoked = False
+
+        if revoked:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has been revoked",
@@ -130,6 +159,28 @@ async def decode_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+async def track_refresh_token(token: str) -> None:
+    """
+    Record a newly issued refresh token as the only live token of its family.
+    """
+    claims = jwt.get_unverified_claims(token)
+    await store_refresh_jti(claims["fam"], claims["jti"], int(claims["exp"] - time.time()))
+
+async def rotate_refresh_token(payload: dict[str, Any], new_token: str) -> bool:
+    """
+    Replace the presented refresh token (decoded payload) with its successor.
+
+    Returns False if the presented token was not the live token of its
+    family, i.e. it was already used; the whole family is then revoked.
+    """
+    claims = jwt.get_unverified_claims(new_token)
+    return await rotate_refresh_jti(
+        payload["fam"],
+        payload["jti"],
+        claims["jti"],
+        int(claims["exp"] - time.time())
+    )
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -140,9 +191,9 @@ async def get_current_user(
     """
     try:
         payload = await decode_token(token, TokenType.ACCESS)
-        user_id = payload["sub"]
+        user_id = UUID(payload["sub"])
         
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
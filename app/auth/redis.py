@@ -1,6 +1,32 @@
 # app/auth/redis.py
+import time
+from typing import Iterable, Optional
 from redis import asyncio as aioredis
-from app.core.config import settings
+from redis.exceptions import RedisError
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Set of every registered email, used to short-circuit lookups for unknown
+# addresses. The sentinel member is only added once the set has been fully
+# loaded from the database; until then callers must fall back to the
+# database. Keeping the marker inside the set means eviction can only ever
+# drop the set and its marker together, never leave a stale "ready" behind.
+KNOWN_EMAILS_KEY = "users:emails"
+KNOWN_EMAILS_SENTINEL = ""
+
+# Refresh token rotation: each login starts a token family and
+# refresh:{family_id} holds the JTI of the family's only live refresh token.
+# Rotation is a compare-and-swap; presenting any other JTI means an old
+# token was reused, so the family is deleted and every token in it dies.
+_ROTATE_REFRESH_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+redis.call('DEL', KEYS[1])
+return 0
+"""
 
 async def get_redis():
     if not hasattr(get_redis, "redis"):
@@ -9,12 +35,90 @@ async def get_redis():
         )
     return get_redis.redis
 
+def blacklist_key(jti: str) -> str:
+    """Redis key marking a token's JTI as revoked"""
+    return f"blacklist:{jti}"
+
 async def add_to_blacklist(jti: str, exp: int):
     """Add a token's JTI to the blacklist"""
     redis = await get_redis()
-    await redis.set(f"blacklist:{jti}", "1", ex=exp)
+    await redis.set(blacklist_key(jti), "1", ex=exp)
 
 async def is_blacklisted(jti: str) -> bool:
     """Check if a token's JTI is blacklisted"""
     redis = await get_redis()
-    return await redis.exists(f"blacklist:{jti}")
\ No newline at end of file
+    return await redis.exists(blacklist_key(jti))
+
+async def blacklist_token(jti: str, exp: int):
+    """Blacklist a token's JTI until the token itself expires"""
+    seconds_until_exp = int(exp - time.time())
+    if seconds_until_exp > 0:
+        await add_to_blacklist(jti, seconds_until_exp)
+
+async def add_known_email(email: str):
+    """
+    Record a registered email in the known-emails set.
+    If that fails the set no longer lists every account, so it is marked
+    not loaded and lookups fall back to the database until it is reloaded.
+    """
+    try:
+        redis = await get_redis()
+        await redis.sadd(KNOWN_EMAILS_KEY, email)
+    except RedisError:
+        await forget_known_emails()
+
+async def forget_known_emails():
+    """Mark the known-emails set as not loaded"""
+    try:
+        redis = await get_redis()
+        await redis.srem(KNOWN_EMAILS_KEY, KNOWN_EMAILS_SENTINEL)
+    except RedisError:
+        pass
+
+async def is_known_email(email: str) -> Optional[bool]:
+    """
+    Check whether an email is registered without touching the database.
+    Returns None if the set is not loaded or Redis is unavailable.
+    """
+    try:
+        redis = await get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.sismember(KNOWN_EMAILS_KEY, KNOWN_EMAILS_SENTINEL)
+            pipe.sismember(KNOWN_EMAILS_KEY, email)
+            ready, known = await pipe.execute()
+    except RedisError:
+        return None
+    if not ready:
+        return None
+    return bool(known)
+
+async def known_emails_loaded() -> bool:
+    """Check whether the known-emails set has been loaded"""
+    redis = await get_redis()
+    return bool(await redis.sismember(KNOWN_EMAILS_KEY, KNOWN_EMAILS_SENTINEL))
+
+async def load_known_emails(emails: Iterable[str], batch_size: int = 1000):
+    """Load all registered emails into the known-emails set, then mark it loaded"""
+    redis = await get_redis()
+    batch = []
+    for email in emails:
+        batch.append(email)
+        if len(batch) >= batch_size:
+            await redis.sadd(KNOWN_EMAILS_KEY, *batch)
+            batch = []
+    if batch:
+        await redis.sadd(KNOWN_EMAILS_KEY, *batch)
+    await redis.sadd(KNOWN_EMAILS_KEY, KNOWN_EMAILS_SENTINEL)
+
+async def store_refresh_jti(family_id: str, jti: str, ttl: int):
+    """Record the live refresh token JTI for a token family"""
+    redis = await get_redis()
+    await redis.set(f"refresh:{family_id}", jti, ex=max(ttl, 1))
+
+async def rotate_refresh_jti(family_id: str, old_jti: str, new_jti: str, ttl: int) -> bool:
+    """Swap the live JTI of a family; revoke the family if old_jti is stale"""
+    redis = await get_redis()
+    rotated = await redis.eval(
+        _ROTATE_REFRESH_SCRIPT, 1, f"refresh:{family_id}", old_jti, new_jti, max(ttl, 1)
+    )
+    return rotated == 1
@@ -0,0 +1,69 @@
+# app/core/logging_config.py
+"""
+Logging Configuration
+
+Application loggers write to a queue; a single listener thread drains it
+and does the actual stream I/O, so request threads never block on stdout.
+"""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+class RootQueueListener(QueueListener):
+    """QueueListener that hands the root logger its handlers back when stopped."""
+
+    def __init__(self, queue_handler: QueueHandler, moved_handlers, *handlers):
+        super().__init__(queue_handler.queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.moved_handlers = moved_handlers
+
+    def stop(self) -> None:
+        super().stop()
+        root = logging.getLogger()
+        root.removeHandler(self.queue_handler)
+        for handler in self.moved_handlers:
+            root.addHandler(handler)
+
+
+def setup_logging() -> QueueListener:
+    """
+    Route the root logger through a queue and return its (unstarted) listener.
+
+    Handlers already on the root logger (installed by the host process or a
+    test runner) are moved behind the queue rather than discarded; with none,
+    records go to stderr. Calling this again while the queue is in place
+    changes nothing.
+
+    Returns:
+        QueueListener: Start it on startup and stop it on shutdown to flush
+    """
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL)
+
+    if any(isinstance(handler, QueueHandler) for handler in root.handlers):
+        # Already routed through a queue; nothing is ever put on this one
+        return QueueListener(queue.SimpleQueue())
+
+    moved_handlers = list(root.handlers)
+    for handler in moved_handlers:
+        root.removeHandler(handler)
+
+    if moved_handlers:
+        handlers = moved_handlers
+    else:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers = [stream_handler]
+
+    queue_handler = QueueHandler(queue.SimpleQueue())
+    root.addHandler(queue_handler)
+
+    return RootQueueListener(queue_handler, moved_handlers, *handlers)
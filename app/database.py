@@ -2,12 +2,20 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
+from app.core.config import get_settings
+
+settings = get_settings()
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-# Create the default engine and sessionmaker
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Create the default engine and sessionmaker. The pool is sized to match the
+# threadpool that runs sync endpoints, so requests don't queue for connections.
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
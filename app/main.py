@@ -17,41 +17,79 @@ Architecture:
 - templates/ - Web interface (optional)
 """
 
+import logging
+import re
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from fastapi.middleware.cors import CORSMiddleware
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from starlette.convertors import Convertor, register_url_convertor
 
 import uvicorn
 
 # Application imports
-from app.database import Base, engine
+from app.database import SessionLocal, engine
 from app.core.config import get_settings
+from app.core.logging_config import setup_logging
+from app.core.static_files import CachedStaticFiles
+from app.auth.redis import known_emails_loaded, load_known_emails
+from app.models.user import User
 from app.api.auth import router as auth_router
 from app.api.calculations import router as calculations_router
 
 
 settings = get_settings()
+logger = logging.getLogger("app.startup")
 
 
 # ------------------------------------------------------------------------------
 # Lifespan Event: Database Initialization
 # ------------------------------------------------------------------------------
+def check_database():
+    """Open a connection and run a trivial query."""
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def registered_emails():
+    """Read every registered email, for seeding the known-emails set."""
+    with SessionLocal() as db:
+        return [email for (email,) in db.query(User.email).yield_per(1000)]
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
-    Initialize database tables on startup.
+    Initialize logging and check the database on startup.
     """
-    print("🚀 Starting FastAPI Calculator API...")
-    print("📊 Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created successfully!")
-    print(f"📧 Email service configured: {settings.SMTP_HOST}")
-    print(f"🔐 JWT authentication enabled")
+    log_listener = setup_logging()
+    log_listener.start()
+    logger.info("Starting %s", settings.APP_NAME)
+    # Sync endpoints run in AnyIO's threadpool (40 threads by default)
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    # Schema is managed by Alembic (alembic upgrade head); just make sure
+    # the database is reachable before accepting traffic
+    await to_thread.run_sync(check_database)
+    logger.info("Database connection OK")
+    for name in (*WEB_PAGES.values(), *CALCULATION_PAGES.values()):
+        templates.env.get_template(name)
+    try:
+        if not await known_emails_loaded():
+            logger.info("Loading known emails into Redis")
+            emails = await run_in_threadpool(registered_emails)
+            await load_known_emails(emails)
+    except RedisError:
+        logger.warning("Known-email set not loaded, falling back to database", exc_info=True)
+    logger.info("Email service configured: %s", settings.SMTP_HOST)
     yield
-    print("👋 Shutting down FastAPI Calculator API...")
+    logger.info("Shutting down %s", settings.APP_NAME)
+    log_listener.stop()
 
 
 # ------------------------------------------------------------------------------
@@ -86,6 +124,7 @@ app = FastAPI(
     """,
     version=settings.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json"
@@ -114,49 +153,19 @@ app.include_router(calculations_router)
 # ------------------------------------------------------------------------------
 # Static Files and Templates (Optional Web Interface)
 # ------------------------------------------------------------------------------
-app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
-
-
-# ------------------------------------------------------------------------------
-# Web Interface Routes (Optional)
-# ------------------------------------------------------------------------------
-@app.get("/", response_class=HTMLResponse, tags=["Web Interface"])
-def index(request: Request):
-    """Landing page with API information."""
-    return templates.TemplateResponse("index.html", {"request": request})
-
-
-@app.get("/login", response_class=HTMLResponse, tags=["Web Interface"])
-def login_page(request: Request):
-    """Login page."""
-    return templates.TemplateResponse("login.html", {"request": request})
-
-
-@app.get("/register", response_class=HTMLResponse, tags=["Web Interface"])
-def register_page(request: Request):
-    """Registration page."""
-    return templates.TemplateResponse("register.html", {"request": request})
-
-
-@app.get("/dashboard", response_class=HTMLResponse, tags=["Web Interface"])
-def dashboard(request: Request):
-    """User dashboard."""
-    return templates.TemplateResponse("dashboard.html", {"request": request})
-
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
-@app.get("/dashboard/view/{calc_id}", response_class=HTMLResponse, tags=["Web Interface"])
-def view_calculation(request: Request, calc_id: str):
-    """View calculation page."""
-    return templates.TemplateResponse("view_calculation.html", 
-                                     {"request": request, "calc_id": calc_id})
-
-
-@app.get("/dashboard/edit/{calc_id}", response_class=HTMLResponse, tags=["Web Interface"])
-def edit_calculation(request: Request, calc_id: str):
-    """Edit calculation page."""
-    return templates.TemplateResponse("edit_calculation.html", 
-                                     {"request": request, "calc_id": calc_id})
+# Compiled templates are kept for the life of the process (no per-render
+# stat for changes), and the bytecode cache lets restarts skip parsing.
+# With no directory given, Jinja keeps it in a per-user directory (mode
+# 0700, ownership checked) rather than in the shared temp dir
+templates = Jinja2Templates(env=Environment(
+    loader=FileSystemLoader("templates"),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=-1,
+    bytecode_cache=FileSystemBytecodeCache(),
+))
 
 
 # ------------------------------------------------------------------------------
@@ -199,6 +208,7 @@ def api_info():
                 "refresh": "POST /api/auth/refresh",
                 "forgot_password": "POST /api/auth/forgot-password",
                 "reset_password": "POST /api/auth/reset-password",
+                "revoke_all": "POST /api/auth/revoke-all",
                 "me": "GET /api/auth/me"
             },
             "calculations": {
@@ -221,9 +231,59 @@ def api_info():
     }
 
 
+# ------------------------------------------------------------------------------
+# Web Interface Routes (Optional)
+# ------------------------------------------------------------------------------
+# Registered last: "/{page:path}" would otherwise shadow the routes above
+WEB_PAGES = {
+    "": "index.html",
+    "login": "login.html",
+    "register": "register.html",
+    "dashboard": "dashboard.html",
+}
+CALCULATION_PAGES = {
+    "view": "view_calculation.html",
+    "edit": "edit_calculation.html",
+}
+
+
+@app.get("/dashboard/{action}/{calc_id}", response_class=HTMLResponse, tags=["Web Interface"])
+def calculation_page(request: Request, action: str, calc_id: str):
+    """View or edit calculation page."""
+    template = CALCULATION_PAGES.get(action)
+    if template is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return templates.TemplateResponse(template, {"request": request, "calc_id": calc_id})
+
+
+class WebPageConvertor(Convertor):
+    """
+    Matches only the names in WEB_PAGES ("" being the landing page), so any
+    other path falls through to the rest of the routing, including the
+    trailing-slash redirect for /api/... collection URLs.
+    """
+    regex = "|".join(re.escape(name) for name in WEB_PAGES)
+
+    def convert(self, value: str) -> str:
+        return value
+
+    def to_string(self, value: str) -> str:
+        return value
+
+
+register_url_convertor("web_page", WebPageConvertor())
+
+
+@app.get("/{page:web_page}", response_class=HTMLResponse, tags=["Web Interface"])
+def web_page(request: Request, page: str):
+    """Landing, login, registration and dashboard pages."""
+    return templates.TemplateResponse(WEB_PAGES[page], {"request": request})
+
+
 # ------------------------------------------------------------------------------
 # Main Block to Run the Server
 # ------------------------------------------------------------------------------
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("app.main:app", host="127.0.0.1", port=8001, log_level="info")
+    # log_config=None leaves Uvicorn's loggers propagating to the root
+    # logger, so they go through the same queue as the application
+    uvicorn.run("app.main:app", host="127.0.0.1", port=8001, log_level="info", log_config=None)
@@ -17,7 +17,7 @@ basic mathematical operations: addition, subtraction, multiplication, and divisi
 from datetime import datetime
 import uuid
 from typing import List
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float
+from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, declared_attr
 from sqlalchemy.ext.declarative import declared_attr
@@ -54,6 +54,10 @@ class AbstractCalculation:
         - Hides record count
         - Allows for distributed systems
         - Improves security (not guessable)
+        
+        The UUID is generated in Python rather than by the database, so an
+        INSERT never needs RETURNING to learn the key and many rows can be
+        sent in a single batched statement.
         """
         return Column(
             UUID(as_uuid=True), 
@@ -182,7 +186,8 @@ class AbstractCalculation:
         calculation_class = calculation_classes.get(calculation_type.lower())
         if not calculation_class:
             raise ValueError(f"Unsupported calculation type: {calculation_type}")
-        return calculation_class(user_id=user_id, inputs=inputs)
+        # Assign the id up front so it is known before the row is flushed
+        return calculation_class(id=uuid.uuid4(), user_id=user_id, inputs=inputs)
 
     def get_result(self) -> float:
         """
@@ -224,6 +229,12 @@ class Calculation(Base, AbstractCalculation):
         "polymorphic_identity": "calculation",
         #"with_polymorphic": "*"  # Eager load all subclass columns (commented out)
     }
+    __table_args__ = (
+        # Composite index so per-user stats (GROUP BY type) are index-only
+        Index("ix_calculations_user_type", "user_id", "type"),
+        # Composite index for newest-first, keyset-paginated listing
+        Index("ix_calculations_user_created", "user_id", text("created_at DESC"), text("id DESC")),
+    )
 
 class Addition(Calculation):
     """
@@ -17,7 +17,8 @@ The User model is designed to follow security best practices:
 
 import uuid
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import Column, String, Boolean, DateTime, or_
+from typing import Optional
+from sqlalchemy import Column, String, Boolean, DateTime, Index, Integer, or_
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from app.core.config import get_settings
@@ -85,6 +86,13 @@ class User(Base):
     is_verified = Column(Boolean, 
                          default=False) # For email verification status
     
+    # Embedded in every token as "ver"; bumping it revokes all of the
+    # user's outstanding tokens at once
+    jwt_version = Column(Integer, 
+                         default=0, 
+                         server_default="0", 
+                         nullable=False)
+    
     # Email verification
     verification_token = Column(String, nullable=True)  # Token for email verification
     verification_token_expires = Column(DateTime(timezone=True), nullable=True)  # Token expiration
@@ -111,6 +119,18 @@ class User(Base):
                                back_populates="user", 
                                cascade="all, delete-orphan")  # Delete user's calculations when user is deleted
     
+    # Partial indexes for token lookups (verify-email, reset-password).
+    # Only rows with an outstanding token are indexed, since the columns
+    # are NULL for most users.
+    __table_args__ = (
+        Index("ix_users_verification_token",
+              verification_token,
+              postgresql_where=verification_token.isnot(None)),
+        Index("ix_users_reset_token",
+              reset_token,
+              postgresql_where=reset_token.isnot(None)),
+    )
+    
     def __init__(self, *args, **kwargs):
         """Initialize a new user, handling password hashing if provided."""
         if "hashed_password" in kwargs:
@@ -260,6 +280,10 @@ class User(Base):
         if not password or len(password) < 6:
             raise ValueError("Password must be at least 6 characters long")
         
+        # Hash before touching the database: bcrypt is slow, and the session
+        # holds a pooled connection from its first query until commit
+        hashed_password = cls.hash_password(password)
+        
         # Check for duplicate email or username
         existing_user = db.query(cls).filter(
             or_(cls.email == user_data["email"], cls.username == user_data["username"])
@@ -268,7 +292,6 @@ class User(Base):
             raise ValueError("Username or email already exists")
         
         # Create new user instance
-        hashed_password = cls.hash_password(password)
         user = cls(
             first_name=user_data["first_name"],
             last_name=user_data["last_name"],
@@ -302,17 +325,29 @@ class User(Base):
             or_(cls.username == username_or_email, cls.email == username_or_email)
         ).first()
 
-        if not user or not user.verify_password(password):
+        if not user:
+            # Run bcrypt anyway so unknown usernames take as long as wrong passwords
+            from app.auth.jwt import dummy_verify_password
+            dummy_verify_password()
+            return None
+
+        if not user.verify_password(password):
             return None
 
         # Update the last_login timestamp
         user.last_login = utcnow()
         db.flush()
 
-        # Generate tokens
-        access_token = cls.create_access_token({"sub": str(user.id)})
-        refresh_token = cls.create_refresh_token({"sub": str(user.id)})
-        expires_at = utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        # Generate tokens (expires_at must match the jittered JWT exp claim)
+        from app.auth.jwt import get_access_token_expires_delta
+        expires_delta = get_access_token_expires_delta()
+        access_token = cls.create_access_token(
+            {"sub": str(user.id), "ver": user.jwt_version}, expires_delta
+        )
+        refresh_token = cls.create_refresh_token(
+            {"sub": str(user.id), "ver": user.jwt_version, "fam": str(uuid.uuid4())}
+        )
+        expires_at = utcnow() + expires_delta
 
         return {
             "access_token": access_token,
@@ -323,19 +358,21 @@ class User(Base):
         }
 
     @classmethod
-    def create_access_token(cls, data: dict) -> str:
+    def create_access_token(cls, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """
         Create a JWT access token.
         
         Args:
-            data: Token payload data
+            data: Token payload data ("sub" plus any extra claims)
+            expires_delta: Token lifetime (defaults to the jittered access token lifetime)
             
         Returns:
             str: JWT access token
         """
         from app.auth.jwt import create_token
         from app.schemas.token import TokenType
-        return create_token(data["sub"], TokenType.ACCESS)
+        extra_claims = {k: v for k, v in data.items() if k != "sub"}
+        return create_token(data["sub"], TokenType.ACCESS, expires_delta, extra_claims)
 
     @classmethod
     def create_refresh_token(cls, data: dict) -> str:
@@ -343,14 +380,15 @@ class User(Base):
         Create a JWT refresh token.
         
         Args:
-            data: Token payload data
+            data: Token payload data ("sub" plus any extra claims, e.g. "fam")
             
         Returns:
             str: JWT refresh token
         """
         from app.auth.jwt import create_token
         from app.schemas.token import TokenType
-        return create_token(data["sub"], TokenType.REFRESH)
+        extra_claims = {k: v for k, v in data.items() if k != "sub"}
+        return create_token(data["sub"], TokenType.REFRESH, extra_claims=extra_claims)
 
     @classmethod
     def verify_token(cls, token: str):
@@ -363,7 +401,6 @@ class User(Base):
         Returns:
             UUID: User ID if token is valid, None otherwise
         """
-        from app.core.config import settings
         from jose import jwt, JWTError
         try:
             payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -0,0 +1,43 @@
+"""jwt_version and query indexes
+
+Adds users.jwt_version and the partial token indexes and composite
+calculation indexes. The indexes are built CONCURRENTLY, outside the
+migration transaction, so existing tables stay writable while they build.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 11:20:04.118275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('jwt_version', sa.Integer(), server_default='0', nullable=False))
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_verification_token', 'users', ['verification_token'], unique=False, postgresql_where=sa.text('verification_token IS NOT NULL'), postgresql_concurrently=True)
+        op.create_index('ix_users_reset_token', 'users', ['reset_token'], unique=False, postgresql_where=sa.text('reset_token IS NOT NULL'), postgresql_concurrently=True)
+        op.create_index('ix_calculations_user_type', 'calculations', ['user_id', 'type'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_calculations_user_created', 'calculations', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_calculations_user_created', table_name='calculations', postgresql_concurrently=True)
+        op.drop_index('ix_calculations_user_type', table_name='calculations', postgresql_concurrently=True)
+        op.drop_index('ix_users_reset_token', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_verification_token', table_name='users', postgresql_concurrently=True)
+
+    op.drop_column('users', 'jwt_version')
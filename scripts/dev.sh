@@ -39,4 +39,5 @@ echo -e "${GREEN}📖 API Documentation: http://localhost:8000/docs${NC}"
 echo -e "${GREEN}🔄 Auto-reload enabled for development${NC}"
 echo ""
 
+alembic upgrade head
 uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
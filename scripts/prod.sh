@@ -26,9 +26,9 @@ if [ ! -f ".env" ]; then
     exit 1
 fi
 
-# Run database initialization
-echo -e "${YELLOW}🗄️  Initializing database...${NC}"
-python -m app.database_init
+# Apply database migrations
+echo -e "${YELLOW}🗄️  Applying database migrations...${NC}"
+alembic upgrade head
 
 # Run the application with production settings
 echo -e "${GREEN}✅ Starting FastAPI application on http://0.0.0.0:8000${NC}"
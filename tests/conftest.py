@@ -12,9 +12,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from playwright.sync_api import sync_playwright, Browser, Page
 
+from app.auth.redis import get_redis
 from app.database import Base, get_engine, get_sessionmaker
 from app.models.user import User
-from app.core.config import settings
+from app.core.config import get_settings
 from app.database_init import init_db, drop_db
 
 # ======================================================================================
@@ -29,6 +30,7 @@ logger = logging.getLogger(__name__)
 # ======================================================================================
 # Database Configuration
 # ======================================================================================
+settings = get_settings()
 fake = Faker()
 Faker.seed(12345)
 
@@ -158,6 +160,22 @@ def seed_users(db_session: Session, request) -> List[User]:
     logger.info(f"Seeded {len(users)} users.")
     return users
 
+# ======================================================================================
+# Redis Fixtures
+# ======================================================================================
+@pytest.fixture
+def fresh_redis():
+    """
+    Give the test its own Redis client. get_redis caches one client, which is
+    bound to the event loop it was created on, and each asyncio.run() call
+    starts a new loop.
+    """
+    if hasattr(get_redis, "redis"):
+        del get_redis.redis
+    yield
+    if hasattr(get_redis, "redis"):
+        del get_redis.redis
+
 # ======================================================================================
 # FastAPI Server Fixture
 # ======================================================================================
@@ -0,0 +1,54 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from app.auth.auth_cache import cache_auth, get_cached_auth, hash_token
+from app.schemas.user import UserResponse
+
+sample_user = UserResponse(
+    id=uuid4(),
+    username="cacheduser",
+    email="cached@example.com",
+    first_name="Cached",
+    last_name="User",
+    is_active=True,
+    is_verified=True,
+    created_at=datetime.now(timezone.utc),
+    updated_at=datetime.now(timezone.utc),
+)
+
+
+def test_hash_token_is_stable_sha256():
+    assert hash_token("abc") == hash_token("abc")
+    assert hash_token("abc") != hash_token("abd")
+    assert len(hash_token("abc")) == 64
+
+
+def test_get_cached_auth_hit():
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=sample_user.model_dump_json())
+
+    with patch("app.auth.auth_cache.get_redis", AsyncMock(return_value=redis)):
+        cached = asyncio.run(get_cached_auth("somehash"))
+
+    assert cached == sample_user
+    redis.get.assert_awaited_once_with("auth:user:somehash")
+
+
+def test_get_cached_auth_miss():
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=None)
+
+    with patch("app.auth.auth_cache.get_redis", AsyncMock(return_value=redis)):
+        assert asyncio.run(get_cached_auth("somehash")) is None
+
+
+def test_cache_auth_skips_expired_token():
+    get_redis = AsyncMock()
+
+    with patch("app.auth.auth_cache.get_redis", get_redis):
+        asyncio.run(cache_auth("somehash", sample_user, int(time.time()) - 10, "somejti", "0"))
+
+    get_redis.assert_not_awaited()
@@ -74,6 +74,17 @@ def test_calculation_factory_addition():
     assert isinstance(calc, Addition), "Factory did not return an Addition instance."
     assert calc.get_result() == sum(inputs), "Incorrect addition result."
 
+def test_calculation_factory_assigns_id():
+    """
+    Test that Calculation.create assigns the UUID before the row is flushed.
+    """
+    calc = Calculation.create(
+        calculation_type='addition',
+        user_id=dummy_user_id(),
+        inputs=[1, 2],
+    )
+    assert isinstance(calc.id, uuid.UUID), "Factory did not assign an id."
+
 def test_calculation_factory_subtraction():
     """
     Test the Calculation.create factory method for subtraction.
@@ -0,0 +1,117 @@
+# tests/integration/test_calculation_routes.py
+
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.calculations import delete_calculation, get_calculation_stats, list_calculations
+from app.models.calculation import Calculation
+
+
+def add_calculations(db_session, user, specs, created_at=None):
+    """Insert calculations for a user; specs is a list of (type, inputs)"""
+    calcs = []
+    for calc_type, inputs in specs:
+        calc = Calculation.create(calc_type, user.id, inputs)
+        calc.result = calc.get_result()
+        if created_at is not None:
+            calc.created_at = created_at
+            calc.updated_at = created_at
+        calcs.append(calc)
+    db_session.add_all(calcs)
+    db_session.commit()
+    return calcs
+
+
+def list_page(db_session, user, **params):
+    response = list_calculations(
+        skip=params.get("skip", 0),
+        limit=params.get("limit", 100),
+        cursor=params.get("cursor"),
+        cursor_id=params.get("cursor_id"),
+        current_user=user,
+        db=db_session
+    )
+    return json.loads(response.body)
+
+
+def test_list_calculations_cursor_pages_through_ties(db_session, test_user):
+    """Test that keyset pages neither skip nor repeat rows sharing a created_at"""
+    same_instant = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    calcs = add_calculations(
+        db_session,
+        test_user,
+        [("addition", [1, 2]), ("addition", [3, 4]), ("addition", [5, 6])],
+        created_at=same_instant
+    )
+
+    first_page = list_page(db_session, test_user, limit=2)
+    last = first_page[-1]
+    second_page = list_page(
+        db_session,
+        test_user,
+        limit=2,
+        cursor=datetime.fromisoformat(last["created_at"]),
+        cursor_id=last["id"]
+    )
+
+    seen = [item["id"] for item in first_page + second_page]
+    assert len(first_page) == 2
+    assert len(second_page) == 1
+    assert sorted(seen) == sorted(str(calc.id) for calc in calcs)
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_list_calculations_newest_first(db_session, test_user):
+    """Test that calculations are listed newest first"""
+    older = add_calculations(
+        db_session, test_user, [("addition", [1, 1])],
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc)
+    )
+    newer = add_calculations(
+        db_session, test_user, [("subtraction", [5, 1])],
+        created_at=datetime(2024, 1, 2, tzinfo=timezone.utc)
+    )
+
+    page = list_page(db_session, test_user)
+
+    assert [item["id"] for item in page] == [str(newer[0].id), str(older[0].id)]
+
+
+def test_calculation_stats_counts_by_type(db_session, test_user):
+    """Test that stats group the user's calculations by type"""
+    add_calculations(
+        db_session,
+        test_user,
+        [("addition", [1, 2]), ("addition", [3, 4]), ("division", [8, 2])]
+    )
+
+    stats = get_calculation_stats(current_user=test_user, db=db_session)
+
+    assert stats["total_calculations"] == 3
+    assert stats["operations"] == {"addition": 2, "division": 1}
+    assert stats["user"]["id"] == str(test_user.id)
+
+
+def test_delete_calculation_not_found(db_session, test_user):
+    """Test that deleting a missing calculation returns 404"""
+    with pytest.raises(HTTPException) as exc_info:
+        delete_calculation(uuid4(), current_user=test_user, db=db_session)
+
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == "Calculation not found"
+
+
+def test_delete_calculation_of_other_user_not_found(db_session, test_user, seed_users):
+    """Test that a user cannot delete another user's calculation"""
+    other_user = seed_users[0]
+    calc = add_calculations(db_session, other_user, [("addition", [1, 2])])[0]
+
+    with pytest.raises(HTTPException) as exc_info:
+        delete_calculation(calc.id, current_user=test_user, db=db_session)
+
+    assert exc_info.value.status_code == 404
+    assert db_session.get(Calculation, calc.id) is not None
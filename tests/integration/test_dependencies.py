@@ -1,7 +1,15 @@
+import asyncio
 import pytest
-from unittest.mock import patch
+from anyio import from_thread
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import HTTPException, status
-from app.auth.dependencies import get_current_user, get_current_active_user
+from jose import jwt
+from redis.exceptions import RedisError
+from app.auth.auth_cache import get_cached_auth, hash_token, invalidate_token, invalidate_user
+from app.auth.dependencies import get_authenticated_user, get_current_user, get_current_active_user
+from app.auth.jwt import create_token, decode_token
+from app.auth.redis import blacklist_token
+from app.schemas.token import TokenType
 from app.schemas.user import UserResponse
 from app.models.user import User
 from uuid import uuid4
@@ -103,3 +111,144 @@ def test_get_current_active_user_inactive(mock_verify_token):
 
     assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
     assert exc_info.value.detail == "Inactive user"
+
+
+# ======================================================================================
+# get_authenticated_user (Redis auth cache in front of the database)
+# ======================================================================================
+def make_db_user(jwt_version=0):
+    now = datetime.now(timezone.utc)
+    return User(
+        id=uuid4(),
+        first_name="Cache",
+        last_name="User",
+        email=f"cache-{uuid4().hex[:8]}@example.com",
+        username=f"cache_{uuid4().hex[:8]}",
+        password="not-a-real-hash",
+        is_active=True,
+        is_verified=True,
+        jwt_version=jwt_version,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def make_db(user):
+    db = MagicMock()
+    db.get.return_value = user
+    return db
+
+
+def test_get_authenticated_user_miss_populates_cache(fresh_redis):
+    user = make_db_user()
+    db = make_db(user)
+    token = create_token(user.id, TokenType.ACCESS, extra_claims={"ver": 0})
+
+    async def scenario():
+        current_user = await get_authenticated_user(token=token, db=db)
+        return current_user, await get_cached_auth(hash_token(token))
+
+    current_user, cached = asyncio.run(scenario())
+
+    assert current_user.id == user.id
+    assert cached == current_user
+    db.get.assert_called_once_with(User, user.id)
+
+
+def test_get_authenticated_user_cache_hit_skips_database(fresh_redis):
+    user = make_db_user()
+    db = make_db(user)
+    token = create_token(user.id, TokenType.ACCESS, extra_claims={"ver": 0})
+
+    async def scenario():
+        first = await get_authenticated_user(token=token, db=db)
+        second = await get_authenticated_user(token=token, db=db)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second
+    db.get.assert_called_once()
+
+
+def test_get_authenticated_user_rejects_stale_jwt_version(fresh_redis):
+    user = make_db_user(jwt_version=1)
+    token = create_token(user.id, TokenType.ACCESS, extra_claims={"ver": 0})
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(get_authenticated_user(token=token, db=make_db(user)))
+
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_get_authenticated_user_rejects_token_after_logout(fresh_redis):
+    user = make_db_user()
+    db = make_db(user)
+    token = create_token(user.id, TokenType.ACCESS, extra_claims={"ver": 0})
+
+    async def scenario():
+        await get_authenticated_user(token=token, db=db)
+
+        # Same steps as the logout route
+        payload = await decode_token(token, TokenType.ACCESS)
+        await blacklist_token(payload["jti"], payload["exp"])
+        await invalidate_token(hash_token(token))
+
+        await get_authenticated_user(token=token, db=db)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(scenario())
+
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+    assert exc_info.value.detail == "Token has been revoked"
+
+
+def test_cache_miss_racing_revoke_all_is_not_cached(fresh_redis):
+    user = make_db_user()
+    token = create_token(user.id, TokenType.ACCESS, extra_claims={"ver": 0})
+
+    def load_then_revoke(model, user_id):
+        # revoke-all commits and invalidates after the miss loaded the old row
+        from_thread.run(invalidate_user, user_id)
+        return user
+
+    db = MagicMock()
+    db.get.side_effect = load_then_revoke
+
+    async def scenario():
+        await get_authenticated_user(token=token, db=db)
+        return await get_cached_auth(hash_token(token))
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_cache_miss_racing_logout_is_not_cached(fresh_redis):
+    user = make_db_user()
+    token = create_token(user.id, TokenType.ACCESS, extra_claims={"ver": 0})
+
+    def load_then_logout(model, user_id):
+        payload = jwt.get_unverified_claims(token)
+        from_thread.run(blacklist_token, payload["jti"], payload["exp"])
+        from_thread.run(invalidate_token, hash_token(token))
+        return user
+
+    db = MagicMock()
+    db.get.side_effect = load_then_logout
+
+    async def scenario():
+        await get_authenticated_user(token=token, db=db)
+        return await get_cached_auth(hash_token(token))
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_get_authenticated_user_without_redis():
+    user = make_db_user()
+    token = create_token(user.id, TokenType.ACCESS, extra_claims={"ver": 0})
+    redis_down = AsyncMock(side_effect=RedisError("down"))
+
+    with patch("app.auth.auth_cache.get_redis", redis_down), \
+         patch("app.auth.redis.get_redis", redis_down):
+        current_user = asyncio.run(get_authenticated_user(token=token, db=make_db(user)))
+
+    assert current_user.id == user.id
@@ -0,0 +1,85 @@
+import smtplib
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.auth.email import SMTPConnectionPool, email_service
+
+
+def make_pool(**kwargs):
+    return SMTPConnectionPool("smtp.example.com", 587, "user", "secret", **kwargs)
+
+
+@patch("app.auth.email.smtplib.SMTP")
+def test_pool_reuses_released_connection(mock_smtp):
+    mock_smtp.return_value.noop.return_value = (250, b"OK")
+    pool = make_pool()
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    assert second is first
+    mock_smtp.assert_called_once_with("smtp.example.com", 587)
+    first.login.assert_called_once_with("user", "secret")
+
+
+@patch("app.auth.email.smtplib.SMTP")
+def test_pool_replaces_dead_connection(mock_smtp):
+    dead, fresh = MagicMock(), MagicMock()
+    dead.noop.return_value = (421, b"Closing")
+    mock_smtp.side_effect = [dead, fresh]
+    pool = make_pool()
+
+    pool.release(pool.acquire())
+
+    assert pool.acquire() is fresh
+    dead.quit.assert_called_once()
+
+
+@patch("app.auth.email.smtplib.SMTP")
+def test_pool_closes_connection_when_login_fails(mock_smtp):
+    server = mock_smtp.return_value
+    server.login.side_effect = smtplib.SMTPAuthenticationError(535, b"Bad credentials")
+    pool = make_pool()
+
+    with pytest.raises(smtplib.SMTPAuthenticationError):
+        pool.acquire()
+
+    server.close.assert_called_once()
+
+
+@patch("app.auth.email.smtplib.SMTP")
+def test_pool_rotates_connection_after_max_messages(mock_smtp):
+    pool = make_pool(max_messages=2)
+
+    server = pool.acquire()
+    pool.release(server)
+    pool.release(pool.acquire())
+
+    server.quit.assert_called_once()
+
+
+def test_verification_email_escapes_username():
+    with patch.object(email_service, "_send_email", return_value=True) as send:
+        email_service.send_verification_email(
+            "user@example.com", "<b>bob</b>", "token123", "http://localhost:8000"
+        )
+
+    _, _, html_content, text_content = send.call_args.args
+    assert "&lt;b&gt;bob&lt;/b&gt;" in html_content
+    assert "<b>bob</b>" not in html_content
+    assert "token=token123" in html_content
+    assert "<b>bob</b>" in text_content
+
+
+@patch("app.auth.email.smtplib.SMTP")
+def test_send_failure_is_logged_with_traceback(mock_smtp, caplog):
+    mock_smtp.side_effect = OSError("connection refused")
+
+    sent = email_service._send_email("user@example.com", "Subject", "<p>Hi</p>")
+
+    assert sent is False
+    record = caplog.records[-1]
+    assert "SMTP send failed to=user@example.com" in record.getMessage()
+    assert record.exc_info is not None
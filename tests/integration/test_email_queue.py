@@ -0,0 +1,134 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.auth.email_queue import EMAIL_STREAM, _direct_sends, enqueue_email
+
+welcome_fields = {"to_email": "queued@example.com", "username": "queued", "first_name": "Queued"}
+
+
+def test_enqueue_email_adds_to_stream():
+    redis = MagicMock()
+    redis.xadd = AsyncMock()
+
+    with patch("app.auth.email_queue.get_redis", AsyncMock(return_value=redis)):
+        asyncio.run(enqueue_email("welcome", welcome_fields))
+
+    args, _ = redis.xadd.call_args
+    assert args == (EMAIL_STREAM, {"kind": "welcome", **welcome_fields})
+
+
+def test_enqueue_email_sends_directly_without_redis():
+    sender = MagicMock(return_value=True)
+
+    async def enqueue_and_wait():
+        await enqueue_email("welcome", welcome_fields)
+        await asyncio.gather(*_direct_sends)
+
+    with patch("app.auth.email_queue.get_redis", AsyncMock(side_effect=RedisError("down"))), \
+         patch.dict("app.auth.email_queue.EMAIL_SENDERS", {"welcome": sender}):
+        asyncio.run(enqueue_and_wait())
+
+    sender.assert_called_once_with(**welcome_fields)
+
+
+def test_enqueue_email_rejects_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown email kind"):
+        asyncio.run(enqueue_email("newsletter", {}))
+
+
+def test_failed_send_is_left_pending():
+    from app.auth.email_queue import _deliver
+
+    redis = MagicMock()
+    redis.xack = AsyncMock()
+    sender = MagicMock(return_value=False)
+
+    with patch.dict("app.auth.email_queue.EMAIL_SENDERS", {"welcome": sender}):
+        asyncio.run(_deliver(redis, b"1-0", {b"kind": b"welcome", **{k.encode(): v.encode() for k, v in welcome_fields.items()}}))
+
+    sender.assert_called_once_with(**welcome_fields)
+    redis.xack.assert_not_awaited()
+
+
+def test_sent_email_is_acked_and_deleted():
+    from app.auth.email_queue import EMAIL_GROUP, _deliver
+
+    redis = MagicMock()
+    redis.xack = AsyncMock()
+    redis.xdel = AsyncMock()
+    sender = MagicMock(return_value=True)
+
+    with patch.dict("app.auth.email_queue.EMAIL_SENDERS", {"welcome": sender}):
+        asyncio.run(_deliver(redis, b"1-0", {b"kind": b"welcome", **{k.encode(): v.encode() for k, v in welcome_fields.items()}}))
+
+    redis.xack.assert_awaited_once_with(EMAIL_STREAM, EMAIL_GROUP, b"1-0")
+    redis.xdel.assert_awaited_once_with(EMAIL_STREAM, b"1-0")
+
+
+def test_trimmed_entry_is_acked_without_sending():
+    from app.auth.email_queue import EMAIL_GROUP, _deliver
+
+    redis = MagicMock()
+    redis.xack = AsyncMock()
+    redis.xdel = AsyncMock()
+
+    asyncio.run(_deliver(redis, b"1-0", None))
+
+    redis.xack.assert_awaited_once_with(EMAIL_STREAM, EMAIL_GROUP, b"1-0")
+
+
+def test_retry_pages_past_entries_in_backoff():
+    from app.auth.email_queue import EMAIL_RETRY_BASE_MS, _retry_failed
+
+    def waiting(message_id):
+        # Second attempt, still inside its 2x backoff window
+        return {
+            "message_id": message_id,
+            "times_delivered": 2,
+            "time_since_delivered": EMAIL_RETRY_BASE_MS
+        }
+
+    redis = MagicMock()
+    redis.xpending_range = AsyncMock(side_effect=[
+        [waiting(b"1-0"), waiting(b"2-0")],
+        [waiting(b"3-0")],
+    ])
+    redis.xclaim = AsyncMock()
+
+    asyncio.run(_retry_failed(redis, "worker-1", batch_size=2))
+
+    starts = [call.kwargs["min"] for call in redis.xpending_range.await_args_list]
+    assert starts == ["-", "(2-0"]
+    redis.xclaim.assert_not_awaited()
+
+
+def test_malformed_entry_is_dropped():
+    from app.auth.email_queue import EMAIL_GROUP, _deliver
+
+    redis = MagicMock()
+    redis.xack = AsyncMock()
+    redis.xdel = AsyncMock()
+
+    # The real welcome sender; username and first_name are missing
+    with patch("app.auth.email.EmailService._send_email") as send:
+        asyncio.run(_deliver(redis, b"1-0", {b"kind": b"welcome", b"to_email": b"x@example.com"}))
+
+    send.assert_not_called()
+    redis.xack.assert_awaited_once_with(EMAIL_STREAM, EMAIL_GROUP, b"1-0")
+
+
+def test_sender_exception_leaves_entry_pending(caplog):
+    from app.auth.email_queue import _deliver
+
+    redis = MagicMock()
+    redis.xack = AsyncMock()
+    sender = MagicMock(side_effect=RuntimeError("template exploded"))
+
+    with patch.dict("app.auth.email_queue.EMAIL_SENDERS", {"welcome": sender}):
+        asyncio.run(_deliver(redis, b"1-0", {b"kind": b"welcome", **{k.encode(): v.encode() for k, v in welcome_fields.items()}}))
+
+    redis.xack.assert_not_awaited()
+    assert "template exploded" in caplog.text
@@ -0,0 +1,39 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from redis.exceptions import RedisError
+
+from app.auth.redis import (
+    KNOWN_EMAILS_KEY,
+    KNOWN_EMAILS_SENTINEL,
+    add_known_email,
+    get_redis,
+    is_known_email,
+    load_known_emails,
+)
+
+
+def test_add_known_email_failure_marks_set_not_loaded():
+    redis = MagicMock()
+    redis.sadd = AsyncMock(side_effect=RedisError("write failed"))
+    redis.srem = AsyncMock()
+
+    with patch("app.auth.redis.get_redis", AsyncMock(return_value=redis)):
+        asyncio.run(add_known_email("new@example.com"))
+
+    redis.srem.assert_awaited_once_with(KNOWN_EMAILS_KEY, KNOWN_EMAILS_SENTINEL)
+
+
+def test_known_email_lookup_falls_back_after_failed_add(fresh_redis):
+    async def scenario():
+        await (await get_redis()).delete(KNOWN_EMAILS_KEY)
+        await load_known_emails(["old@example.com"])
+        assert await is_known_email("new@example.com") is False
+
+        with patch("redis.asyncio.client.Redis.sadd", AsyncMock(side_effect=RedisError("write failed"))):
+            await add_known_email("new@example.com")
+
+        return await is_known_email("new@example.com")
+
+    # Unknown (None), not "definitely not registered" (False)
+    assert asyncio.run(scenario()) is None
@@ -0,0 +1,46 @@
+import logging
+from logging.handlers import QueueHandler
+
+from app.core.logging_config import setup_logging
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_setup_logging_keeps_existing_handlers():
+    root = logging.getLogger()
+    existing = ListHandler()
+    root.addHandler(existing)
+    try:
+        listener = setup_logging()
+        listener.start()
+        logging.getLogger("app.test").warning("through the queue")
+        listener.stop()
+
+        assert existing.messages == ["through the queue"]
+        # Handed back once the listener stops
+        assert existing in root.handlers
+        assert not any(isinstance(h, QueueHandler) for h in root.handlers)
+    finally:
+        root.removeHandler(existing)
+
+
+def test_setup_logging_is_idempotent():
+    root = logging.getLogger()
+    listener = setup_logging()
+    listener.start()
+    try:
+        second = setup_logging()
+        second.start()
+        second.stop()
+
+        queue_handlers = [h for h in root.handlers if isinstance(h, QueueHandler)]
+        assert len(queue_handlers) == 1
+    finally:
+        listener.stop()
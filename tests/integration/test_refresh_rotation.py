@@ -0,0 +1,76 @@
+# tests/integration/test_refresh_rotation.py
+
+import asyncio
+from uuid import uuid4
+
+from jose import jwt
+
+from app.auth.jwt import create_token, rotate_refresh_token, track_refresh_token
+from app.auth.redis import get_redis
+from app.schemas.token import TokenType
+
+
+def new_refresh_token(family_id):
+    token = create_token(uuid4(), TokenType.REFRESH, extra_claims={"fam": family_id})
+    return token, jwt.get_unverified_claims(token)
+
+
+async def live_jti(family_id):
+    redis = await get_redis()
+    jti = await redis.get(f"refresh:{family_id}")
+    return jti.decode() if isinstance(jti, bytes) else jti
+
+
+def test_rotate_refresh_token_swaps_live_jti(fresh_redis):
+    """Test that rotating the live token makes its successor the live one"""
+    family_id = str(uuid4())
+    first, first_claims = new_refresh_token(family_id)
+    second, second_claims = new_refresh_token(family_id)
+
+    async def scenario():
+        await track_refresh_token(first)
+        rotated = await rotate_refresh_token(first_claims, second)
+        return rotated, await live_jti(family_id)
+
+    rotated, jti = asyncio.run(scenario())
+
+    assert rotated is True
+    assert jti == second_claims["jti"]
+
+
+def test_replayed_refresh_token_revokes_family(fresh_redis):
+    """Test that reusing a rotated-out token kills the whole family"""
+    family_id = str(uuid4())
+    first, first_claims = new_refresh_token(family_id)
+    second, second_claims = new_refresh_token(family_id)
+    third, _ = new_refresh_token(family_id)
+
+    async def scenario():
+        await track_refresh_token(first)
+        await rotate_refresh_token(first_claims, second)
+        replayed = await rotate_refresh_token(first_claims, third)
+        # The legitimate successor is revoked along with the family
+        successor = await rotate_refresh_token(second_claims, third)
+        return replayed, successor, await live_jti(family_id)
+
+    replayed, successor, jti = asyncio.run(scenario())
+
+    assert replayed is False
+    assert successor is False
+    assert jti is None
+
+
+def test_rotate_refresh_token_unknown_family(fresh_redis):
+    """Test that a token from an untracked family cannot be rotated"""
+    family_id = str(uuid4())
+    first, first_claims = new_refresh_token(family_id)
+    second, _ = new_refresh_token(family_id)
+
+    async def scenario():
+        rotated = await rotate_refresh_token(first_claims, second)
+        return rotated, await live_jti(family_id)
+
+    rotated, jti = asyncio.run(scenario())
+
+    assert rotated is False
+    assert jti is None
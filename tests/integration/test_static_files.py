@@ -0,0 +1,59 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.static_files import (
+    DEFAULT_CACHE_CONTROL,
+    HASHED_CACHE_CONTROL,
+    CachedStaticFiles,
+)
+
+
+def make_client(tmp_path):
+    (tmp_path / "app.js").write_text("console.log('plain');")
+    (tmp_path / "app.3f2a9c1b.js").write_text("console.log('hashed');")
+
+    app = FastAPI()
+    app.mount("/static", CachedStaticFiles(directory=str(tmp_path)), name="static")
+    return TestClient(app)
+
+
+def test_static_files_set_cache_control(tmp_path):
+    client = make_client(tmp_path)
+
+    plain = client.get("/static/app.js")
+    hashed = client.get("/static/app.3f2a9c1b.js")
+
+    assert plain.status_code == 200
+    assert plain.text == "console.log('plain');"
+    assert plain.headers["cache-control"] == DEFAULT_CACHE_CONTROL
+    assert hashed.headers["cache-control"] == HASHED_CACHE_CONTROL
+
+
+def test_static_files_not_modified(tmp_path):
+    client = make_client(tmp_path)
+
+    etag = client.get("/static/app.js").headers["etag"]
+    response = client.get("/static/app.js", headers={"if-none-match": etag})
+
+    assert response.status_code == 304
+
+
+def test_static_files_head_has_no_body(tmp_path):
+    client = make_client(tmp_path)
+
+    response = client.head("/static/app.js")
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["content-length"] == str(len("console.log('plain');"))
+    assert response.headers["cache-control"] == DEFAULT_CACHE_CONTROL
+
+
+def test_static_files_range_request(tmp_path):
+    client = make_client(tmp_path)
+
+    response = client.get("/static/app.js", headers={"range": "bytes=0-6"})
+
+    assert response.status_code == 206
+    assert response.text == "console"
+    assert response.headers["cache-control"] == DEFAULT_CACHE_CONTROL
@@ -1,7 +1,8 @@
 # tests/integration/test_user_auth.py
 
 import pytest
-from uuid import UUID
+from unittest.mock import patch
+from uuid import UUID, uuid4
 import pydantic_core
 from sqlalchemy.exc import IntegrityError
 from app.models.user import User
@@ -99,6 +100,14 @@ def test_user_last_login_update(db_session, fake_user_data):
     db_session.refresh(user)
     assert user.last_login is not None
 
+def test_authenticate_unknown_user_runs_dummy_hash(db_session):
+    """Test that an unknown username still costs one bcrypt verification"""
+    with patch("app.auth.jwt.pwd_context.dummy_verify") as dummy_verify:
+        auth_result = User.authenticate(db_session, "no_such_user", "TestPass123")
+    
+    assert auth_result is None
+    dummy_verify.assert_called_once()
+
 def test_unique_email_username(db_session):
     """Test uniqueness constraints for email and username"""
     # Create first user with specific test data
@@ -160,6 +169,91 @@ def test_token_creation_and_verification(db_session, fake_user_data):
     decoded_user_id = User.verify_token(token)
     assert decoded_user_id == user.id
 
+def test_refresh_token_carries_family_claim():
+    """Test that extra payload data is embedded as token claims"""
+    from jose import jwt
+    from app.core.config import get_settings
+    settings = get_settings()
+    
+    token = User.create_refresh_token({"sub": str(uuid4()), "fam": "family-1"})
+    payload = jwt.decode(token, settings.JWT_REFRESH_SECRET_KEY, algorithms=[settings.ALGORITHM])
+    
+    assert payload["fam"] == "family-1"
+    assert payload["type"] == "refresh"
+
+def test_authenticate_embeds_jwt_version(db_session, fake_user_data):
+    """Test that issued tokens carry the user's current jwt_version"""
+    from jose import jwt
+    from app.core.config import get_settings
+    settings = get_settings()
+    
+    fake_user_data['password'] = "TestPass123"
+    user, _ = User.register(db_session, fake_user_data)
+    user.jwt_version = 3
+    db_session.commit()
+    
+    auth_result = User.authenticate(db_session, fake_user_data['username'], "TestPass123")
+    payload = jwt.decode(auth_result["access_token"], settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
+    
+    assert payload["ver"] == 3
+
+def login_then_revoke_all(db_session, fake_user_data):
+    """Log a user in, then revoke all their tokens; returns the pre-revoke tokens"""
+    import asyncio
+    from anyio import to_thread
+    from app.api.auth import revoke_all_tokens
+    from app.auth.dependencies import get_authenticated_user
+    from app.auth.jwt import track_refresh_token
+    
+    fake_user_data['password'] = "TestPass123"
+    user, _ = User.register(db_session, fake_user_data)
+    db_session.commit()
+    auth_result = User.authenticate(db_session, fake_user_data['username'], "TestPass123")
+    db_session.commit()
+    
+    async def scenario():
+        await track_refresh_token(auth_result["refresh_token"])
+        # Resolve once so the access token is in the auth cache
+        await get_authenticated_user(token=auth_result["access_token"], db=db_session)
+        await to_thread.run_sync(lambda: revoke_all_tokens(current_user=user, db=db_session))
+    
+    asyncio.run(scenario())
+    return user, auth_result
+
+def test_revoke_all_bumps_jwt_version(db_session, fake_user_data, fresh_redis):
+    """Test that revoke-all increments the user's jwt_version"""
+    user, _ = login_then_revoke_all(db_session, fake_user_data)
+    
+    db_session.refresh(user)
+    assert user.jwt_version == 1
+
+def test_revoke_all_rejects_old_access_token(db_session, fake_user_data, fresh_redis):
+    """Test that an access token issued before revoke-all gets a 401"""
+    import asyncio
+    from fastapi import HTTPException
+    from app.auth.dependencies import get_authenticated_user
+    
+    _, auth_result = login_then_revoke_all(db_session, fake_user_data)
+    
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(get_authenticated_user(token=auth_result["access_token"], db=db_session))
+    
+    assert exc_info.value.status_code == 401
+
+def test_revoke_all_rejects_old_refresh_token(db_session, fake_user_data, fresh_redis):
+    """Test that a refresh token issued before revoke-all cannot be used"""
+    import asyncio
+    from fastapi import HTTPException
+    from app.api.auth import refresh_token
+    
+    _, auth_result = login_then_revoke_all(db_session, fake_user_data)
+    
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(refresh_token(refresh_token=auth_result["refresh_token"], db=db_session))
+    
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Token has been revoked"
+
 def test_authenticate_with_email(db_session, fake_user_data):
     """Test authentication using email instead of username"""
     fake_user_data['password'] = "TestPass123"
@@ -0,0 +1,26 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+# No `with` block: the lifespan (database check, Redis warm-up) is not needed
+client = TestClient(app)
+
+
+def test_web_pages_render():
+    for path in ("/", "/login", "/register", "/dashboard"):
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+
+
+def test_unknown_page_is_not_found():
+    assert client.get("/no-such-page").status_code == 404
+
+
+def test_api_collection_redirects_to_trailing_slash():
+    get = client.get("/api/calculations", follow_redirects=False)
+    post = client.post("/api/calculations", follow_redirects=False)
+
+    assert get.status_code == 307
+    assert get.headers["location"].endswith("/api/calculations/")
+    assert post.status_code == 307